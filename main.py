@@ -9,7 +9,6 @@ and distribution to participants via email.
 
 import argparse
 import sys
-from src.pipeline import MeetingPipeline
 from src.config import Config
 from src.logger import setup_logger
 
@@ -51,6 +50,24 @@ def main():
         help='Custom message to include in email'
     )
     
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help='Parallel SMTP connections for large participant lists (default: 4)'
+    )
+    
+    parser.add_argument(
+        '--audio-file',
+        help='Process an existing recording instead of capturing audio'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always re-transcribe audio instead of reusing cached transcripts'
+    )
+    
     parser.add_argument(
         '--validate-config',
         action='store_true',
@@ -72,10 +89,15 @@ def main():
         print("✓ Configuration is valid")
         return 0
     
+    # Imported only when running a meeting: pulls in the audio, speech,
+    # docx and email stacks, which --help and --validate-config never need
+    from src.pipeline import MeetingPipeline
+    
     # Create pipeline
     pipeline = MeetingPipeline(
         meeting_title=args.title,
-        participants=args.participants
+        participants=args.participants,
+        use_transcript_cache=not args.no_cache
     )
     
     # Run pipeline
@@ -83,7 +105,9 @@ def main():
         success = pipeline.run_full_pipeline(
             duration_seconds=args.duration,
             action_items=args.action_items,
-            custom_message=args.message
+            custom_message=args.message,
+            email_concurrency=args.concurrency,
+            audio_file=args.audio_file
         )
         
         if success:
@@ -3,8 +3,17 @@
 Supports dual backends:
 - PyAudio (preferred when available)
 - sounddevice (fallback when PyAudio is not installed)
+
+Both backends run in callback mode: the audio thread only hands each block
+to a queue, and a background writer thread drains the queue into the output
+file. Recordings are written as WAV by default, or encoded on the fly to FLAC
+(via soundfile) or Opus (via ffmpeg) to cut transcription upload size.
 """
 
+import queue
+import shutil
+import subprocess
+import threading
 import wave
 import logging
 from datetime import datetime
@@ -13,32 +22,111 @@ from src.config import Config
 
 logger = logging.getLogger(__name__)
 
+AUDIO_FORMATS = ('wav', 'flac', 'opus')
+
+
+class _FlacWriter:
+    """Encode 16-bit PCM frames to FLAC as they are written"""
+
+    def __init__(self, path, channels, rate):
+        import soundfile as sf  # type: ignore
+        self._file = sf.SoundFile(
+            str(path), mode='w', samplerate=rate, channels=channels,
+            subtype='PCM_16', format='FLAC',
+        )
+
+    def writeframes(self, data):
+        self._file.buffer_write(data, dtype='int16')
+
+    def close(self):
+        self._file.close()
+
+
+class _OpusWriter:
+    """Pipe 16-bit PCM frames through ffmpeg into an Opus file"""
+
+    BITRATE = '24k'
+
+    def __init__(self, path, channels, rate):
+        ffmpeg = shutil.which('ffmpeg')
+        if not ffmpeg:
+            raise RuntimeError("ffmpeg is required for Opus encoding")
+        self._proc = subprocess.Popen(
+            [
+                ffmpeg, '-hide_banner', '-loglevel', 'error', '-y',
+                '-f', 's16le', '-ar', str(rate), '-ac', str(channels), '-i', '-',
+                '-c:a', 'libopus', '-b:a', self.BITRATE, str(path),
+            ],
+            stdin=subprocess.PIPE,
+        )
+
+    def writeframes(self, data):
+        self._proc.stdin.write(data)
+
+    def close(self):
+        self._proc.stdin.close()
+        if self._proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self._proc.returncode}")
+
 
 class AudioCapture:
     """Handle audio capture from Teams meetings"""
 
     # Audio configuration
-    CHUNK = 1024
-    CHANNELS = 2
+    CHUNK = 0  # frames per callback; 0 lets PortAudio pick the host API's optimal size
+    CHANNELS = 1  # speech-to-text services transcribe mono
+    INPUT_CHANNELS = 2  # device channels downmixed when mono capture is unavailable
     RATE = 16000
+    SAMPLE_WIDTH = 2  # 16-bit PCM, accepted natively by speech-to-text services
 
-    def __init__(self, output_dir=None):
+    def __init__(self, output_dir=None, latency='high', audio_format=None, blocksize=None):
         """Initialize audio capture.
 
         Args:
             output_dir (str): Directory to save audio files. Defaults to Config.OUTPUT_DIRECTORY
+            latency (str or float): sounddevice stream latency. 'high' favours
+                                    glitch-free bulk capture, 'low' live monitoring
+            audio_format (str): 'wav', 'flac' or 'opus'. Defaults to Config.AUDIO_FORMAT;
+                                always 'wav' with the Azure transcriber
+            blocksize (int): Frames per callback. Defaults to CHUNK (driver-chosen);
+                             larger fixed sizes mean fewer Python wakeups
         """
-        self.output_dir = output_dir or Config.OUTPUT_DIRECTORY
+        self.output_dir = output_dir or Config.ensure_output_directory()
+        self.audio_format = (audio_format or Config.AUDIO_FORMAT or 'wav').lower()
+        if self.audio_format not in AUDIO_FORMATS:
+            logger.warning(f"Unknown audio format '{self.audio_format}', using wav")
+            self.audio_format = 'wav'
+        provider = (Config.TRANSCRIBER_PROVIDER or 'azure').lower()
+        if self.audio_format != 'wav' and provider == 'azure':
+            # Azure file transcription reads the recording with the wave module
+            logger.warning(f"Audio format '{self.audio_format}' is not supported by the Azure transcriber, using wav")
+            self.audio_format = 'wav'
+        self.latency = latency
+        self.blocksize = self.CHUNK if blocksize is None else blocksize
         self.stream = None
-        self.frames = []  # list of bytes
         self.backend = None
+        # Frames are streamed straight into the WAV file while capturing
+        self._wf = None
+        self._write_frames = None
+        self._filepath = None
+        self._frames_written = 0
+        self._expected_frames = None
+        # Blocks handed over from the audio callback to the writer thread
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._writer_error = None
+        self._overflows = 0
+        # Set by the writer after each batch lands on disk; read_next_chunk waits on it
+        self._chunk_ready = threading.Event()
+        self._downmix_pyaudio = False
+        self._downmix_kernel = None
 
         # Try PyAudio first, then fallback to sounddevice
         try:
             import pyaudio  # type: ignore
             self.pyaudio = pyaudio
             self.audio = pyaudio.PyAudio()
-            self.FORMAT = pyaudio.paFloat32
+            self.FORMAT = pyaudio.paInt16
             self.backend = 'pyaudio'
             logger.info("Audio backend: PyAudio")
         except Exception:
@@ -57,91 +145,321 @@ class AudioCapture:
                 self.sd = None
                 self.np = None
 
-    def start_capture(self):
-        """Start capturing audio from the microphone"""
+        self._bind_backend()
+
+    def _bind_backend(self):
+        """Resolve backend-specific operations once instead of per call"""
+        if self.backend == 'pyaudio':
+            self._open_stream = self._open_pyaudio_stream
+            self._stop_stream = self._stop_pyaudio_stream
+            self._stream_latency = self._pyaudio_latency
+            self._release_backend = self.audio.terminate
+        elif self.backend == 'sounddevice':
+            self._open_stream = self._open_sd_stream
+            self._stop_stream = self._stop_sd_stream
+            self._stream_latency = self._sd_latency
+            self._release_backend = lambda: None
+        else:
+            self._open_stream = self._no_backend
+            self._stop_stream = lambda: None
+            self._stream_latency = lambda: 0.0
+            self._release_backend = lambda: None
+
+    @staticmethod
+    def _no_backend():
+        raise RuntimeError("No audio backend available")
+
+    def start_capture(self, filename=None, expected_frames=None):
+        """Start capturing audio from the microphone
+
+        Args:
+            filename (str): Name of the file to stream audio into.
+                            If None, generates timestamp-based name
+            expected_frames (int): Number of frames to record, when the duration
+                                   is known up front. The WAV header is then
+                                   written with the final size and capture
+                                   completes once that many frames are written
+        """
         try:
-            self.frames = []
-            if self.backend == 'pyaudio':
-                self.stream = self.audio.open(
-                    format=self.FORMAT,
-                    channels=self.CHANNELS,
-                    rate=self.RATE,
-                    input=True,
-                    frames_per_buffer=self.CHUNK,
-                )
-            elif self.backend == 'sounddevice':
-                self.stream = self.sd.InputStream(
-                    samplerate=self.RATE,
-                    channels=self.CHANNELS,
-                    dtype='float32',
-                    blocksize=self.CHUNK,
-                )
-                self.stream.start()
-            else:
-                raise RuntimeError("No audio backend available")
-
-            logger.info("Audio capture started")
+            if self.backend is None:
+                self._no_backend()
+
+            self._open_writer(filename, expected_frames)
+            self._start_writer()
+            self.stream = self._open_stream()
+
+            logger.info(f"Audio capture started (input latency {self._input_latency() * 1000:.0f} ms)")
             return True
         except Exception as e:
             logger.error(f"Failed to start audio capture: {e}")
+            self._stop_writer()
+            if self._wf:
+                self._wf.close()
+                self._wf = None
+                self._filepath.unlink(missing_ok=True)
             return False
 
-    def capture_chunk(self):
-        """Capture a chunk of audio data"""
-        if not self.stream:
-            return False
+    def _open_sd_stream(self):
+        """Open and start a sounddevice input stream"""
+        self._load_downmix_kernel()
+        stream = self.sd.InputStream(
+            samplerate=self.RATE,
+            channels=self.INPUT_CHANNELS,
+            dtype='int16',
+            blocksize=self.blocksize,
+            latency=self.latency,
+            callback=self._sd_callback,
+        )
+        stream.start()
+        return stream
 
+    def _stop_sd_stream(self):
+        self.stream.stop()
+        self.stream.close()
+
+    def _stop_pyaudio_stream(self):
+        self.stream.stop_stream()
+        self.stream.close()
+
+    def _open_pyaudio_stream(self):
+        """Open a mono PyAudio stream, falling back to downmixed stereo"""
+        self._downmix_pyaudio = False
         try:
-            if self.backend == 'pyaudio':
-                data = self.stream.read(self.CHUNK, exception_on_overflow=False)
-                self.frames.append(data)
-            elif self.backend == 'sounddevice':
-                data, _ = self.stream.read(self.CHUNK)
-                # data is numpy array float32 (frames, channels)
-                self.frames.append(data.tobytes())
-            else:
-                return False
-            return True
+            return self.audio.open(
+                format=self.FORMAT,
+                channels=self.CHANNELS,
+                rate=self.RATE,
+                input=True,
+                frames_per_buffer=self.blocksize,
+                stream_callback=self._pyaudio_callback,
+            )
         except Exception as e:
-            logger.error(f"Failed to capture audio chunk: {e}")
+            logger.info(f"Mono capture unavailable ({e}); downmixing {self.INPUT_CHANNELS} channels")
+
+        import numpy as np  # type: ignore
+        self.np = np
+        self._load_downmix_kernel()
+        self._downmix_pyaudio = True
+        return self.audio.open(
+            format=self.FORMAT,
+            channels=self.INPUT_CHANNELS,
+            rate=self.RATE,
+            input=True,
+            frames_per_buffer=self.blocksize,
+            stream_callback=self._pyaudio_callback,
+        )
+
+    def _pyaudio_latency(self):
+        return self.stream.get_input_latency()
+
+    def _sd_latency(self):
+        latency = self.stream.latency
+        return latency[0] if isinstance(latency, tuple) else latency
+
+    def _input_latency(self):
+        """Input latency reported by the open stream, in seconds"""
+        try:
+            return self._stream_latency()
+        except Exception:
+            return 0.0
+
+    def _load_downmix_kernel(self):
+        """Load (and JIT-compile, when Numba is available) the downmix kernel"""
+        from src import pcm_kernels
+        pcm_kernels.warm_up()
+        self._downmix_kernel = pcm_kernels.downmix_stereo_i16
+
+    def _downmix(self, block):
+        """Average an int16 (frames, channels) block down to mono"""
+        # A fresh output per block: it is handed to the writer thread, so a
+        # shared preallocated buffer could be overwritten before it is written
+        out = self.np.empty(block.shape[0], dtype=self.np.int16)
+        return self._downmix_kernel(block, out)
+
+    def _pyaudio_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio stream callback; runs on the audio thread"""
+        if status:
+            self._overflows += 1
+        if self._downmix_pyaudio:
+            block = self.np.frombuffer(in_data, dtype=self.np.int16).reshape(-1, self.INPUT_CHANNELS)
+            in_data = self._downmix(block)
+        self._queue.put_nowait(in_data)
+        return (None, self.pyaudio.paContinue)
+
+    def _sd_callback(self, indata, frames, time, status):
+        """sounddevice stream callback; runs on the audio thread"""
+        if status:
+            self._overflows += 1
+        if indata.shape[1] > 1:
+            # The downmix already produced a fresh array; queue it without
+            # a further tobytes() copy
+            self._queue.put_nowait(self._downmix(indata))
+        else:
+            # indata is reused by PortAudio once the callback returns
+            self._queue.put_nowait(bytes(indata))
+
+    def _open_writer(self, filename=None, expected_frames=None):
+        """Open the output file so chunks can be written as they arrive"""
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"meeting_{timestamp}.{self.audio_format}"
+
+        self._filepath = Path(self.output_dir) / filename
+        self._frames_written = 0
+        self._expected_frames = expected_frames
+        if self.audio_format == 'flac':
+            self._wf = _FlacWriter(self._filepath, self.CHANNELS, self.RATE)
+            self._write_frames = self._wf.writeframes
+        elif self.audio_format == 'opus':
+            self._wf = _OpusWriter(self._filepath, self.CHANNELS, self.RATE)
+            self._write_frames = self._wf.writeframes
+        else:
+            self._wf = wave.open(str(self._filepath), 'wb')
+            self._wf.setnchannels(self.CHANNELS)
+            self._wf.setsampwidth(self.SAMPLE_WIDTH)
+            self._wf.setframerate(self.RATE)
+            if expected_frames:
+                # Declared up front so a full-length recording never needs its
+                # header patched; one stopped early is patched once by close()
+                self._wf.setnframes(expected_frames)
+            # writeframes() would seek back and rewrite the header after every
+            # block whose running size differs from the declared one
+            self._write_frames = self._wf.writeframesraw
+
+    def _start_writer(self):
+        """Start the background thread that drains captured blocks to disk"""
+        self._writer_error = None
+        self._overflows = 0
+        self._writer = threading.Thread(target=self._writer_loop, name="audio-writer", daemon=True)
+        self._writer.start()
+
+    def _writer_loop(self):
+        frame_bytes = self.CHANNELS * self.SAMPLE_WIDTH
+        # Reused batch buffer: blocks that queued up while the previous write
+        # was in flight are coalesced into a single write call. Blocks may be
+        # bytes or numpy arrays; both are appended through a memoryview, since
+        # ``bytearray += ndarray`` would run NumPy's element-wise add instead
+        buf = bytearray()
+        stopping = False
+        while not stopping:
+            data = self._queue.get()
+            try:
+                while data is not None:
+                    if self._writer_error is None:
+                        buf += memoryview(data)
+                    try:
+                        data = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                if self._expected_frames:
+                    # Drop anything past the requested duration
+                    remaining = max(self._expected_frames - self._frames_written, 0)
+                    del buf[remaining * frame_bytes:]
+
+                if buf and self._writer_error is None:
+                    self._write_frames(buf)
+                    self._frames_written += len(buf) // frame_bytes
+            except Exception as e:
+                # Reported through capture_chunk(); keep draining (without
+                # buffering) so the audio callback never blocks
+                self._writer_error = e
+            # Only the sentinel ends the loop; a failing block leaves data set
+            stopping = data is None
+            del buf[:]
+            self._chunk_ready.set()
+
+    def _stop_writer(self):
+        """Flush queued blocks and stop the writer thread"""
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        if self._writer_error is not None:
+            logger.error(f"Failed to write audio data: {self._writer_error}")
+        if self._overflows:
+            logger.warning(f"Audio input overflowed {self._overflows} time(s) during capture")
+
+    def capture_chunk(self):
+        """Check that capture is running.
+
+        Audio is delivered by the backend callback and written by the writer
+        thread, so this no longer reads from the stream itself. It is kept for
+        callers that poll capture health in their loop, and returns False once
+        ``expected_frames`` have been recorded.
+        """
+        if not self.stream or not self._wf:
+            return False
+        if self._writer_error is not None:
+            logger.error(f"Failed to capture audio chunk: {self._writer_error}")
+            return False
+        if self._expected_frames and self._frames_written >= self._expected_frames:
+            # Requested duration has been recorded
+            return False
+        return True
+
+    def read_next_chunk(self, timeout=None):
+        """Block until the next chunk of audio has been written.
+
+        Waits on the writer thread instead of polling, so an idle capture loop
+        costs no wakeups. wake() and stop_capture() release a waiting caller
+        straight away.
+
+        Args:
+            timeout (float): Seconds to wait at most (None = until audio arrives)
+
+        Returns:
+            bool: True while capture is healthy, False once it has stopped,
+                  failed or recorded ``expected_frames``
+        """
+        if not self.capture_chunk():
             return False
+        self._chunk_ready.wait(timeout)
+        self._chunk_ready.clear()
+        return self.capture_chunk()
+
+    def wake(self):
+        """Release a caller blocked in read_next_chunk"""
+        self._chunk_ready.set()
 
     def stop_capture(self):
         """Stop audio capture"""
         if self.stream:
             try:
-                if self.backend == 'pyaudio':
-                    self.stream.stop_stream()
-                    self.stream.close()
-                elif self.backend == 'sounddevice':
-                    self.stream.stop()
-                    self.stream.close()
+                self._stop_stream()
             finally:
+                self._stop_writer()
+                self.wake()
                 logger.info("Audio capture stopped")
 
     def save_audio(self, filename=None):
-        """Save captured audio to a WAV file"""
-        if not self.frames:
+        """Finalize the audio file that capture was streamed into
+
+        Args:
+            filename (str): Optional new name for the recording. The file is
+                            renamed in place, so no audio data is copied
+
+        Returns:
+            str: Path to the saved audio file or None
+        """
+        if not self._wf:
             logger.warning("No audio frames to save")
             return None
 
         try:
-            if filename is None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"meeting_{timestamp}.wav"
-
-            filepath = Path(self.output_dir) / filename
-
-            with wave.open(str(filepath), 'wb') as wf:
-                wf.setnchannels(self.CHANNELS)
-                # sample width in bytes: PyAudio gives size, sounddevice uses float32 (4 bytes)
-                if self.backend == 'pyaudio' and self.audio and self.FORMAT is not None:
-                    sampwidth = self.audio.get_sample_size(self.FORMAT)
-                else:
-                    sampwidth = 4
-                wf.setsampwidth(sampwidth)
-                wf.setframerate(self.RATE)
-                wf.writeframes(b''.join(self.frames))
+            self._stop_writer()
+            self._wf.close()
+            self._wf = None
+
+            if not self._frames_written:
+                logger.warning("No audio frames to save")
+                self._filepath.unlink(missing_ok=True)
+                return None
+
+            filepath = self._filepath
+            if filename is not None:
+                filepath = self._filepath.replace(Path(self.output_dir) / filename)
 
             logger.info(f"Audio saved to {filepath}")
             return str(filepath)
@@ -154,16 +472,19 @@ class AudioCapture:
         try:
             if self.stream:
                 try:
-                    if self.backend == 'pyaudio':
-                        self.stream.close()
-                    elif self.backend == 'sounddevice':
-                        self.stream.close()
+                    self.stream.close()
                 except Exception:
                     pass
-            if self.backend == 'pyaudio' and self.audio:
+            self._stop_writer()
+            if self._wf:
                 try:
-                    self.audio.terminate()
+                    self._wf.close()
                 except Exception:
                     pass
+                self._wf = None
+            try:
+                self._release_backend()
+            except Exception:
+                pass
         finally:
             logger.info("Audio resources cleaned up")
@@ -2,16 +2,16 @@
 
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+# Settings that, when already present in the environment (systemd, Docker, CI)
+# and no .env file is next to the app, mean a tree-wide .env search is pointless
+_ENV_PRESET_KEYS = ('AZURE_SPEECH_KEY', 'EMAIL_SENDER', 'EMAIL_PASSWORD')
+
+
 # Optional dependency: python-dotenv with robust .env discovery
 def _load_env_robust():
-    try:
-        from dotenv import load_dotenv  # type: ignore
-    except Exception:
-        # dotenv not available; rely on existing environment variables
-        return False
-
     # Candidate locations for .env
     candidates = []
     try:
@@ -29,10 +29,23 @@ def _load_env_robust():
     except Exception:
         pass
 
-    for env_path in candidates:
-        if env_path.exists():
-            load_dotenv(dotenv_path=str(env_path))
-            return True
+    env_path = next((path for path in candidates if path.exists()), None)
+    if env_path is None and all(os.environ.get(key) for key in _ENV_PRESET_KEYS):
+        # Environment is already populated and there is no .env to read;
+        # skip importing dotenv and searching up the tree
+        return True
+
+    try:
+        from dotenv import load_dotenv  # type: ignore
+    except Exception:
+        # dotenv not available; rely on existing environment variables
+        return False
+
+    if env_path is not None:
+        # Existing environment variables still win; the file only fills in
+        # the settings that are not already set
+        load_dotenv(dotenv_path=str(env_path))
+        return True
 
     # Fallback to default behavior (searching up the tree)
     load_dotenv()
@@ -41,30 +54,91 @@ def _load_env_robust():
 _load_env_robust()
 
 
+def _as_bool(value):
+    return value.lower() in ('1', 'true', 'yes')
+
+
+@lru_cache(maxsize=1)
+def _check_provider(provider, azure_key, azure_region, openai_key):
+    """Validate provider settings; memoized so GUI restarts re-check for free"""
+    if provider == 'azure':
+        if not azure_key or not azure_region:
+            raise ValueError("TRANSCRIBER_PROVIDER=azure requires AZURE_SPEECH_KEY and AZURE_SPEECH_REGION")
+    elif provider == 'openai':
+        if not openai_key:
+            raise ValueError("TRANSCRIBER_PROVIDER=openai requires OPENAI_API_KEY")
+    # whisper_local and mock do not require cloud API keys
+    return True
+
+
+class _env:
+    """Config attribute read from the environment on first access
+
+    The parsed value then replaces the descriptor on the class, so settings a
+    run never touches are never parsed and later reads are plain attributes.
+    """
+
+    def __init__(self, default='', cast=str):
+        self.default = default
+        self.cast = cast
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        value = self.cast(os.getenv(self.name, self.default))
+        setattr(owner, self.name, value)
+        return value
+
+
 class Config:
     """Base configuration class"""
     
     # Teams Integration
-    TEAMS_MEETING_ID = os.getenv('TEAMS_MEETING_ID', '')
+    TEAMS_MEETING_ID = _env('')
     
     # Azure Speech Services
-    AZURE_SPEECH_KEY = os.getenv('AZURE_SPEECH_KEY', '')
-    AZURE_SPEECH_REGION = os.getenv('AZURE_SPEECH_REGION', 'eastus')
+    AZURE_SPEECH_KEY = _env('')
+    AZURE_SPEECH_REGION = _env('eastus')
     
     # Email Configuration
-    EMAIL_SENDER = os.getenv('EMAIL_SENDER', '')
-    EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD', '')
-    EMAIL_SMTP_SERVER = os.getenv('EMAIL_SMTP_SERVER', 'smtp-mail.outlook.com')
-    EMAIL_SMTP_PORT = int(os.getenv('EMAIL_SMTP_PORT', '587'))
+    EMAIL_SENDER = _env('')
+    EMAIL_PASSWORD = _env('')
+    EMAIL_SMTP_SERVER = _env('smtp-mail.outlook.com')
+    EMAIL_SMTP_PORT = _env('587', int)
+    # Implicit TLS (SMTP_SSL, usually port 465) instead of STARTTLS; always on for port 465
+    EMAIL_USE_SSL = _env('', _as_bool)
+    # Upper bound on parallel SMTP connections; keep under the provider's limit
+    EMAIL_MAX_CONCURRENCY = _env('5', int)
+    # Emails sent over one SMTP connection before it is reopened (0 = no limit)
+    MAX_EMAILS_PER_CONNECTION = _env('1000', int)
     
     # Application Settings
-    OUTPUT_DIRECTORY = os.getenv('OUTPUT_DIRECTORY', './meeting_notes')
-    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    OUTPUT_DIRECTORY = _env('./meeting_notes')
+    LOG_LEVEL = _env('INFO')
+    # Recording format: 'wav', 'flac' (needs soundfile) or 'opus' (needs ffmpeg)
+    AUDIO_FORMAT = _env('wav')
     # Transcription provider selection: 'azure', 'whisper_local', 'openai', 'mock'
-    TRANSCRIBER_PROVIDER = os.getenv('TRANSCRIBER_PROVIDER', 'azure')
+    TRANSCRIBER_PROVIDER = _env('azure')
+    # Days to keep cached transcripts under OUTPUT_DIRECTORY/.transcripts (0 = never expire)
+    TRANSCRIPT_CACHE_TTL_DAYS = _env('30', int)
+    # Disable the transcript cache entirely (same as --no-cache)
+    TRANSCRIPT_NO_CACHE = _env('', _as_bool)
+    # Days to keep cached notes documents under OUTPUT_DIRECTORY/.notes_cache (0 = never expire)
+    NOTES_CACHE_TTL_DAYS = _env('30', int)
+    # Always rebuild the notes document instead of reusing OUTPUT_DIRECTORY/.notes_cache
+    NOTES_NO_CACHE = _env('', _as_bool)
+    # Concurrent requests when long recordings are transcribed in segments
+    TRANSCRIBE_MAX_CONCURRENCY = _env('5', int)
+    # Model size for TRANSCRIBER_PROVIDER=whisper_local: tiny, base, small, medium, large
+    WHISPER_MODEL = _env('small')
+    # faster-whisper precision: 'auto' (float16 on GPU, int8 on CPU), int8, float16, float32
+    WHISPER_COMPUTE_TYPE = _env('auto')
+    # Device for local Whisper: 'auto' (CUDA when available), 'cuda' or 'cpu'
+    WHISPER_DEVICE = _env('auto')
 
     # Provider-specific keys (optional depending on provider)
-    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
+    OPENAI_API_KEY = _env('')
     # Additional provider keys can be added as needed
     
     @classmethod
@@ -77,17 +151,14 @@ class Config:
         - Email credentials are not strictly required at startup; sending will be skipped/fail gracefully if missing.
         """
         provider = cls.TRANSCRIBER_PROVIDER.lower() if cls.TRANSCRIBER_PROVIDER else 'azure'
-        if provider == 'azure':
-            if not cls.AZURE_SPEECH_KEY or not cls.AZURE_SPEECH_REGION:
-                raise ValueError("TRANSCRIBER_PROVIDER=azure requires AZURE_SPEECH_KEY and AZURE_SPEECH_REGION")
-        elif provider == 'openai':
-            if not cls.OPENAI_API_KEY:
-                raise ValueError("TRANSCRIBER_PROVIDER=openai requires OPENAI_API_KEY")
-        # whisper_local and mock do not require cloud API keys
+        # Keyed on the values themselves, so a changed setting is re-checked
+        _check_provider(provider, cls.AZURE_SPEECH_KEY, cls.AZURE_SPEECH_REGION, cls.OPENAI_API_KEY)
 
         # Email credentials are optional at validation time; sending will check later.
         return True
 
-
-# Create output directory if it doesn't exist
-os.makedirs(Config.OUTPUT_DIRECTORY, exist_ok=True)
+    @classmethod
+    def ensure_output_directory(cls):
+        """Create the output directory if it doesn't exist and return it"""
+        os.makedirs(cls.OUTPUT_DIRECTORY, exist_ok=True)
+        return cls.OUTPUT_DIRECTORY
@@ -1,22 +1,102 @@
 """Email sending module for distributing meeting notes"""
 
+import asyncio
+import contextlib
+import io
+import mmap
+import queue
+import shutil
 import smtplib
+import ssl
 import logging
+import threading
+import time
 from pathlib import Path
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email.mime.text import MIMEText
+from email.message import EmailMessage
 from email.utils import formatdate
-from email import encoders
 from src.config import Config
 
 logger = logging.getLogger(__name__)
 
 
+class _ResumableSMTP_SSL(smtplib.SMTP_SSL):
+    """SMTP over implicit TLS that offers a previous TLS session for resumption"""
+
+    def __init__(self, *args, tls_session=None, **kwargs):
+        # Must be set before SMTP_SSL.__init__ connects
+        self.tls_session = tls_session
+        super().__init__(*args, **kwargs)
+
+    def _get_socket(self, host, port, timeout):
+        sock = smtplib.SMTP._get_socket(self, host, port, timeout)
+        return self.context.wrap_socket(sock, server_hostname=self._host, session=self.tls_session)
+
+
+class SMTPSession:
+    """
+    Authenticated SMTP connection that is recycled after a number of sends
+    
+    Providers cap how many messages one connection may carry and may drop
+    the rest silently, so once ``sent_count`` reaches the limit the session
+    sends QUIT and logs in again on a fresh connection before the next send.
+    Anything else is delegated to the underlying smtplib connection.
+    """
+    
+    def __init__(self, connect, max_messages=None):
+        """
+        Args:
+            connect (callable): Returns a new logged-in smtplib connection
+            max_messages (int): Sends per connection before reconnecting
+                                (defaults to Config.MAX_EMAILS_PER_CONNECTION, 0 = no limit)
+        """
+        self._connect = connect
+        self.max_messages = Config.MAX_EMAILS_PER_CONNECTION if max_messages is None else max_messages
+        self.server = connect()
+        self.sent_count = 0
+    
+    def reconnect(self):
+        """Replace the connection with a freshly authenticated one"""
+        try:
+            self.server.quit()
+        except Exception:
+            self.server.close()
+        self.server = self._connect()
+        self.sent_count = 0
+    
+    def _before_send(self):
+        if self.max_messages and self.sent_count >= self.max_messages:
+            logger.info(f"Sent {self.sent_count} emails on this connection; reconnecting")
+            self.reconnect()
+    
+    def send_message(self, message, *args, **kwargs):
+        self._before_send()
+        result = self.server.send_message(message, *args, **kwargs)
+        self.sent_count += 1
+        return result
+    
+    def sendmail(self, from_addr, to_addrs, msg, *args, **kwargs):
+        self._before_send()
+        result = self.server.sendmail(from_addr, to_addrs, msg, *args, **kwargs)
+        self.sent_count += 1
+        return result
+    
+    def __getattr__(self, name):
+        return getattr(self.server, name)
+
+
 class EmailSender:
     """Handle sending meeting notes via email"""
+
+    # Recipient count above which send_bulk fans out over several connections
+    POOL_THRESHOLD = 20
+    # Replies that mean "try again later": service closing, mailbox busy,
+    # TLS temporarily unavailable
+    TRANSIENT_CODES = (421, 450, 454)
+    MAX_RETRIES = 3
+    RETRY_BACKOFF_SECONDS = 1
     
-    def __init__(self, sender_email=None, sender_password=None, smtp_server=None, smtp_port=None):
+    def __init__(self, sender_email=None, sender_password=None, smtp_server=None, smtp_port=None,
+                 use_ssl=None):
         """
         Initialize email sender with credentials
         
@@ -25,11 +105,150 @@ class EmailSender:
             sender_password (str): Email password or app password
             smtp_server (str): SMTP server address
             smtp_port (int): SMTP server port
+            use_ssl (bool): Connect with implicit TLS (SMTP_SSL) instead of STARTTLS.
+                            Defaults to Config.EMAIL_USE_SSL, or True on port 465
         """
         self.sender_email = sender_email or Config.EMAIL_SENDER
         self.sender_password = sender_password or Config.EMAIL_PASSWORD
         self.smtp_server = smtp_server or Config.EMAIL_SMTP_SERVER
         self.smtp_port = smtp_port or Config.EMAIL_SMTP_PORT
+        if use_ssl is None:
+            use_ssl = Config.EMAIL_USE_SSL or self.smtp_port == 465
+        self.use_ssl = use_ssl
+        # One TLS context per sender: the CA store is loaded once and TLS
+        # sessions from earlier connections can be resumed on reconnect
+        self._ssl_context = ssl.create_default_context()
+        self._tls_session = None
+        # Authenticated connection reused across sends and sessions
+        self._smtp = None
+        self._lock = threading.RLock()
+    
+    def _connect(self):
+        """Open an SMTP connection with TLS and login already done"""
+        logger.info(f"Connecting to {self.smtp_server}:{self.smtp_port}")
+        if self.use_ssl:
+            server = _ResumableSMTP_SSL(
+                self.smtp_server, self.smtp_port,
+                context=self._ssl_context, tls_session=self._tls_session
+            )
+        else:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            if not self.use_ssl:
+                server.starttls(context=self._ssl_context)
+            server.login(self.sender_email, self.sender_password)
+            if self.use_ssl:
+                # Available once the handshake (and TLS 1.3 ticket) has been read
+                self._tls_session = server.sock.session
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _new_session(self):
+        """Open a connection wrapped in a per-connection send counter"""
+        return SMTPSession(self._connect)
+    
+    def close(self):
+        """Close the persistent SMTP connection, if one is open"""
+        with self._lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except smtplib.SMTPException:
+                    self._smtp.close()
+                except OSError:
+                    pass
+                self._smtp = None
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    @contextlib.contextmanager
+    def open_session(self):
+        """
+        Borrow the sender's authenticated SMTP connection
+        
+        The connection is opened (TLS and login included) on first use and kept
+        on the sender, so later sessions skip the handshake. It stays open when
+        the block exits; call close() to release it.
+        
+        Yields:
+            SMTPSession: Connected, logged-in SMTP session
+        """
+        with self._lock:
+            if self._smtp is not None:
+                try:
+                    # The cached connection may have idled out since it was opened
+                    self._smtp.noop()
+                except (smtplib.SMTPException, OSError):
+                    self._smtp.close()
+                    self._smtp = None
+            if self._smtp is None:
+                self._smtp = self._new_session()
+            try:
+                yield self._smtp
+            except smtplib.SMTPServerDisconnected:
+                self._smtp = None
+                raise
+    
+    def warm_up(self):
+        """
+        Open the persistent connection ahead of the first send
+        
+        Returns:
+            bool: True if the connection is ready, False otherwise
+        """
+        try:
+            with self.open_session():
+                return True
+        except Exception as e:
+            logger.warning(f"Could not open SMTP connection ahead of sending: {e}")
+            return False
+    
+    @staticmethod
+    def _prepare_attachments(attachments):
+        """
+        Resolve attachment paths once per send
+        
+        Args:
+            attachments (list): List of file paths to attach
+            
+        Returns:
+            list: (path, filename) tuples for the attachments that exist
+        """
+        prepared = []
+        for attachment_path in attachments or ():
+            path = Path(attachment_path)
+            if path.is_file():
+                prepared.append((path, path.name))
+            else:
+                logger.warning(f"Attachment not found: {attachment_path}")
+        return prepared
+    
+    def _build_message(self, recipient_emails, subject, body, attachments=None):
+        """Build the MIME message shared by all sends
+        
+        Args:
+            attachments (list): (path, filename) tuples from _prepare_attachments
+        """
+        message = EmailMessage()
+        message['From'] = self.sender_email
+        message['To'] = ", ".join(recipient_emails)
+        message['Date'] = formatdate(localtime=True)
+        message['Subject'] = subject
+        
+        # Add body
+        message.set_content(body)
+        
+        # Add attachments
+        for attachment_path, filename in attachments or ():
+            self._attach_file(message, attachment_path, filename)
+        
+        return message
     
     def send_email(self, recipient_emails, subject, body, attachments=None):
         """
@@ -48,29 +267,12 @@ class EmailSender:
             recipient_emails = [recipient_emails]
         
         try:
-            # Create message
-            message = MIMEMultipart()
-            message['From'] = self.sender_email
-            message['To'] = ", ".join(recipient_emails)
-            message['Date'] = formatdate(localtime=True)
-            message['Subject'] = subject
-            
-            # Add body
-            message.attach(MIMEText(body, 'plain'))
-            
-            # Add attachments
-            if attachments:
-                for attachment_path in attachments:
-                    if Path(attachment_path).exists():
-                        self._attach_file(message, attachment_path)
-                    else:
-                        logger.warning(f"Attachment not found: {attachment_path}")
+            message = self._build_message(
+                recipient_emails, subject, body, self._prepare_attachments(attachments)
+            )
             
             # Send email
-            logger.info(f"Connecting to {self.smtp_server}:{self.smtp_port}")
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
+            with self._connect() as server:
                 server.send_message(message)
             
             logger.info(f"Email sent successfully to {', '.join(recipient_emails)}")
@@ -86,15 +288,275 @@ class EmailSender:
             logger.error(f"Failed to send email: {e}")
             return False
     
-    def send_meeting_notes(self, recipient_emails, meeting_title, notes_file_path, message_body=None):
+    def send_bulk(self, recipient_emails, subject, body, attachments=None, concurrency=4):
+        """
+        Send the same email to each recipient as a separate delivery
+        
+        The message is built once and every recipient is sent over an already
+        authenticated connection, so the TLS handshake and login are paid once
+        rather than per recipient. Above POOL_THRESHOLD recipients the list is
+        shared between ``concurrency`` workers, each holding its own connection.
+        
+        Args:
+            recipient_emails (list or str): Email address(es) to send to
+            subject (str): Email subject
+            body (str): Email body text
+            attachments (list): List of file paths to attach
+            concurrency (int): Maximum number of parallel SMTP connections,
+                               capped at Config.EMAIL_MAX_CONCURRENCY
+            
+        Returns:
+            dict: Mapping of recipient to True if sent successfully, False otherwise
+        """
+        if isinstance(recipient_emails, str):
+            recipient_emails = [recipient_emails]
+        
+        try:
+            message = self._build_message(
+                recipient_emails, subject, body, self._prepare_attachments(attachments)
+            )
+        except Exception as e:
+            logger.error(f"Failed to build email: {e}")
+            return {recipient: False for recipient in recipient_emails}
+        
+        concurrency = min(concurrency, Config.EMAIL_MAX_CONCURRENCY)
+        if concurrency > 1 and len(recipient_emails) > self.POOL_THRESHOLD:
+            results = self._send_pooled(message, recipient_emails, concurrency)
+        else:
+            results = {}
+            with self._lock:
+                for recipient in recipient_emails:
+                    results[recipient] = self._send_persistent(message, recipient)
+        
+        sent = sum(results.values())
+        logger.info(f"Bulk email sent to {sent}/{len(recipient_emails)} recipient(s)")
+        return results
+    
+    def _send_persistent(self, message, recipient):
+        """Send to one recipient over the shared connection (caller holds the lock)"""
+        for attempt in range(2):
+            try:
+                if self._smtp is None:
+                    self._smtp = self._new_session()
+                self._smtp.send_message(message, to_addrs=[recipient])
+                return True
+            except smtplib.SMTPServerDisconnected:
+                # Server dropped an idle connection; reconnect once
+                self._smtp = None
+                if attempt:
+                    logger.error(f"SMTP connection lost while sending to {recipient}")
+            except smtplib.SMTPAuthenticationError:
+                logger.error("SMTP Authentication failed. Check email credentials.")
+                return False
+            except smtplib.SMTPException as e:
+                logger.error(f"SMTP error sending to {recipient}: {e}")
+                return False
+            except Exception as e:
+                logger.error(f"Failed to send email to {recipient}: {e}")
+                self._smtp = None
+                return False
+        return False
+    
+    def _is_transient(self, error):
+        """Check whether an SMTP error is worth retrying after a pause"""
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            codes = [code for code, _ in error.recipients.values()]
+        else:
+            codes = [getattr(error, 'smtp_code', None)]
+        return any(code in self.TRANSIENT_CODES for code in codes)
+    
+    def _deliver(self, session, message, recipients):
+        """
+        Send one message, backing off and retrying on transient replies
+        
+        Args:
+            session (SMTPSession): Connection to send over, reconnected if dropped
+            message (EmailMessage): Message to send
+            recipients (list): Envelope recipients, all covered by a single DATA
+            
+        Returns:
+            bool: True if sent successfully, False otherwise
+        """
+        recipient = ', '.join(recipients)
+        error = None
+        reconnect = False
+        for attempt in range(self.MAX_RETRIES + 1):
+            if attempt:
+                delay = self.RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                logger.warning(f"Retrying {recipient} in {delay}s: {error}")
+                time.sleep(delay)
+                if reconnect:
+                    session.reconnect()
+            try:
+                session.send_message(message, to_addrs=recipients)
+                return True
+            except smtplib.SMTPServerDisconnected as e:
+                error, reconnect = e, True
+            except smtplib.SMTPException as e:
+                if not self._is_transient(e):
+                    logger.error(f"SMTP error sending to {recipient}: {e}")
+                    return False
+                # 421 means the server is closing the channel
+                error, reconnect = e, getattr(e, 'smtp_code', None) == 421
+        logger.error(f"Giving up on {recipient} after {self.MAX_RETRIES} retries: {error}")
+        return False
+    
+    def _send_pooled(self, message, recipient_emails, concurrency):
+        """Drain a recipient queue with workers that each own a connection"""
+        pending = queue.Queue()
+        for recipient in recipient_emails:
+            pending.put(recipient)
+        workers = min(concurrency, len(recipient_emails))
+        for _ in range(workers):
+            pending.put(None)
+        results = {}
+        
+        def worker():
+            session = None
+            try:
+                while True:
+                    recipient = pending.get()
+                    if recipient is None:
+                        break
+                    if session is None:
+                        # Connect lazily so idle workers never open a connection
+                        session = self._new_session()
+                    results[recipient] = self._deliver(session, message, [recipient])
+            except Exception as e:
+                logger.error(f"SMTP worker failed: {e}")
+            finally:
+                if session is not None:
+                    try:
+                        session.quit()
+                    except Exception:
+                        session.close()
+        
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Recipients left behind by a failed worker are reported as not sent
+        return {recipient: results.get(recipient, False) for recipient in recipient_emails}
+    
+    async def send_bulk_async(self, recipient_emails, subject, body, attachments=None):
+        """
+        Send the same email to each recipient, one concurrent session per domain
+        
+        Recipients are grouped by domain and each group is delivered over its
+        own aiosmtplib session; the sessions run concurrently with
+        ``asyncio.gather`` so their network round-trips overlap, at most
+        Config.EMAIL_MAX_CONCURRENCY at a time. Falls back to
+        ``send_bulk`` in a worker thread when aiosmtplib is not installed.
+        
+        Args:
+            recipient_emails (list or str): Email address(es) to send to
+            subject (str): Email subject
+            body (str): Email body text
+            attachments (list): List of file paths to attach
+            
+        Returns:
+            dict: Mapping of recipient to True if sent successfully, False otherwise
+        """
+        if isinstance(recipient_emails, str):
+            recipient_emails = [recipient_emails]
+        
+        try:
+            import aiosmtplib  # type: ignore
+        except Exception as e:
+            logger.warning(f"aiosmtplib not available ({e}); sending from a worker thread")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, self.send_bulk, recipient_emails, subject, body, attachments
+            )
+        
+        try:
+            message = self._build_message(
+                recipient_emails, subject, body, self._prepare_attachments(attachments)
+            )
+        except Exception as e:
+            logger.error(f"Failed to build email: {e}")
+            return {recipient: False for recipient in recipient_emails}
+        
+        groups = {}
+        for recipient in recipient_emails:
+            groups.setdefault(recipient.rpartition('@')[2].lower(), []).append(recipient)
+        
+        # Bounds open sessions the same way send_bulk bounds its worker pool
+        semaphore = asyncio.Semaphore(max(Config.EMAIL_MAX_CONCURRENCY, 1))
+        
+        async def send_group(recipients):
+            results = dict.fromkeys(recipients, False)
+            async with semaphore:
+                try:
+                    if self.use_ssl:
+                        tls_args = {'use_tls': True}
+                    else:
+                        tls_args = {'start_tls': True}
+                    smtp = aiosmtplib.SMTP(
+                        hostname=self.smtp_server, port=self.smtp_port,
+                        tls_context=self._ssl_context, **tls_args
+                    )
+                    async with smtp:
+                        await smtp.login(self.sender_email, self.sender_password)
+                        for recipient in recipients:
+                            try:
+                                await smtp.send_message(message, recipients=[recipient])
+                                results[recipient] = True
+                            except aiosmtplib.SMTPException as e:
+                                # Includes SMTPRecipientsRefused, which is not a
+                                # response exception; the session stays usable
+                                logger.error(f"SMTP error sending to {recipient}: {e}")
+                except Exception as e:
+                    logger.error(f"Failed to send email to {', '.join(recipients)}: {e}")
+            return results
+        
+        logger.info(f"Connecting to {self.smtp_server}:{self.smtp_port} ({len(groups)} session(s))")
+        results = {}
+        for group_results in await asyncio.gather(*(send_group(g) for g in groups.values())):
+            results.update(group_results)
+        
+        sent = sum(results.values())
+        logger.info(f"Bulk email sent to {sent}/{len(recipient_emails)} recipient(s)")
+        return results
+    
+    async def send_meeting_notes_async(self, recipient_emails, meeting_title, notes_file_path, message_body=None):
+        """
+        Async counterpart of send_meeting_notes using send_bulk_async
+        
+        Returns:
+            bool: True if the notes reached every recipient, False otherwise
+        """
+        if message_body is None:
+            message_body = f"Please find attached the notes from the {meeting_title} meeting."
+        
+        results = await self.send_bulk_async(
+            recipient_emails=recipient_emails,
+            subject=f"Meeting Notes: {meeting_title}",
+            body=message_body,
+            attachments=[notes_file_path]
+        )
+        return bool(results) and all(results.values())
+    
+    def send_meeting_notes(self, recipient_emails, meeting_title, notes_file_path, message_body=None,
+                           session=None, concurrency=1):
         """
         Send meeting notes as email
         
+        The notes are uploaded once, as a single message addressed to every
+        recipient, over the given session or the sender's persistent
+        connection when omitted; a dropped connection is reopened and the
+        send retried. Large lists with concurrency above 1 go through a worker
+        pool as separate deliveries instead.
+        
         Args:
             recipient_emails (list or str): Email address(es) to send to
             meeting_title (str): Title of the meeting
             notes_file_path (str): Path to the notes document
             message_body (str): Optional custom message body
+            session (smtplib.SMTP): Optional session from open_session() to reuse
+            concurrency (int): Parallel connections for large lists when no session is given
             
         Returns:
             bool: True if email sent successfully, False otherwise
@@ -103,32 +565,79 @@ class EmailSender:
             message_body = f"Please find attached the notes from the {meeting_title} meeting."
         
         subject = f"Meeting Notes: {meeting_title}"
+        if isinstance(recipient_emails, str):
+            recipient_emails = [recipient_emails]
         
-        return self.send_email(
-            recipient_emails=recipient_emails,
-            subject=subject,
-            body=message_body,
-            attachments=[notes_file_path]
-        )
+        if (session is None and min(concurrency, Config.EMAIL_MAX_CONCURRENCY) > 1
+                and len(recipient_emails) > self.POOL_THRESHOLD):
+            results = self.send_bulk(
+                recipient_emails=recipient_emails,
+                subject=subject,
+                body=message_body,
+                attachments=[notes_file_path],
+                concurrency=concurrency
+            )
+            return bool(results) and all(results.values())
+        
+        try:
+            message = self._build_message(
+                recipient_emails, subject, message_body,
+                self._prepare_attachments([notes_file_path])
+            )
+            if session is not None:
+                sent = self._deliver(session, message, recipient_emails)
+            else:
+                with self.open_session() as session:
+                    sent = self._deliver(session, message, recipient_emails)
+        except smtplib.SMTPAuthenticationError:
+            logger.error("SMTP Authentication failed. Check email credentials.")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to send email: {e}")
+            return False
+        
+        if sent:
+            logger.info(f"Email sent successfully to {', '.join(recipient_emails)}")
+        return sent
     
     @staticmethod
-    def _attach_file(message, file_path):
+    def _attach_file(message, file_path, filename=None):
         """
         Attach a file to the email message
         
         Args:
             message: Email message object
             file_path (str): Path to file to attach
+            filename (str): Attachment name. Defaults to the file's name
         """
         try:
+            filename = filename or Path(file_path).name
             with open(file_path, 'rb') as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
-            
-            encoders.encode_base64(part)
-            filename = Path(file_path).name
-            part.add_header('Content-Disposition', f'attachment; filename= {filename}')
-            message.attach(part)
+                try:
+                    mapped = mmap.mmap(attachment.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):
+                    # Empty files and some network/special files cannot be
+                    # mapped; copy them in 1 MiB chunks instead
+                    mapped = None
+                
+                if mapped is not None:
+                    # Map the file instead of reading it; the C base64 encoder used
+                    # by add_attachment then reads 57-byte line slices straight
+                    # from the page cache
+                    with mapped, memoryview(mapped) as data:
+                        message.add_attachment(
+                            data, maintype='application', subtype='octet-stream',
+                            cte='base64', filename=filename
+                        )
+                else:
+                    buffer = io.BytesIO()
+                    shutil.copyfileobj(attachment, buffer, length=1 << 20)
+                    # Encode from the buffer itself rather than a bytes copy
+                    with buffer.getbuffer() as data:
+                        message.add_attachment(
+                            data, maintype='application', subtype='octet-stream',
+                            cte='base64', filename=filename
+                        )
             logger.info(f"File attached: {filename}")
         except Exception as e:
             logger.error(f"Failed to attach file {file_path}: {e}")
@@ -5,21 +5,29 @@ meeting is in progress, then transcribes, formats notes, and emails them
 to participants.
 """
 
+import collections
+import re
 import threading
-import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 
 from src.config import Config
 from src.logger import setup_logger
 from src.audio_capture import AudioCapture
-from src.transcription import get_transcriber
+from src.transcription import get_transcriber, preload_transcriber
 from src.note_formatter import MeetingNoteFormatter
 from src.email_sender import EmailSender
 
 
 logger = setup_logger('teams_notes.gui')
 
+# Log lines are shown in batches at most this often
+LOG_FLUSH_MS = 200
+# Pending lines kept if the UI falls behind; older ones are dropped
+LOG_BUFFER_MAX = 1000
+# Participant addresses may be separated by commas, spaces or newlines
+_PART_RE = re.compile(r'[,\s]+')
+
 
 class TeamsNotesGUI:
     def __init__(self, root: tk.Tk):
@@ -30,6 +38,9 @@ class TeamsNotesGUI:
         # State
         self.stop_event = threading.Event()
         self.worker_thread = None
+        self.audio_capture = None
+        self._log_buf = collections.deque(maxlen=LOG_BUFFER_MAX)
+        self._flush_scheduled = False
 
         # Form variables
         self.var_title = tk.StringVar(value="Team Meeting")
@@ -40,6 +51,9 @@ class TeamsNotesGUI:
         # Layout
         self._build_ui()
 
+        # Load a local model while the user sets up the meeting
+        threading.Thread(target=preload_transcriber, name="model-preload", daemon=True).start()
+
     def _build_ui(self):
         frm = ttk.Frame(self.root, padding=12)
         frm.pack(fill=tk.BOTH, expand=True)
@@ -49,7 +63,7 @@ class TeamsNotesGUI:
         ttk.Entry(frm, textvariable=self.var_title, width=40).grid(row=0, column=1, sticky=tk.EW)
 
         # Participants
-        ttk.Label(frm, text="Participants (comma-separated)").grid(row=1, column=0, sticky=tk.W)
+        ttk.Label(frm, text="Participants (comma or space separated)").grid(row=1, column=0, sticky=tk.W)
         ttk.Entry(frm, textvariable=self.var_participants, width=40).grid(row=1, column=1, sticky=tk.EW)
 
         # Custom message
@@ -84,8 +98,21 @@ class TeamsNotesGUI:
 
     def log(self, msg: str):
         logger.info(msg)
-        self.var_status.set(msg)
-        self.txt_log.insert(tk.END, msg + "\n")
+        self._log_buf.append(msg)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after(LOG_FLUSH_MS, self._flush_log)
+
+    def _flush_log(self):
+        # Runs on the Tk thread: one insert for everything logged since the last flush
+        self._flush_scheduled = False
+        batch = []
+        while self._log_buf:
+            batch.append(self._log_buf.popleft())
+        if not batch:
+            return
+        self.var_status.set(batch[-1])
+        self.txt_log.insert(tk.END, "\n".join(batch) + "\n")
         self.txt_log.see(tk.END)
 
     def on_start(self):
@@ -96,7 +123,7 @@ class TeamsNotesGUI:
             messagebox.showerror("Configuration Error", f"{e}\nPlease update your .env file.")
             return
 
-        participants = [p.strip() for p in self.var_participants.get().split(',') if p.strip()]
+        participants = [p for p in _PART_RE.split(self.var_participants.get()) if p]
         if not participants:
             if not messagebox.askyesno("No Participants", "No participants specified. Continue without emailing notes?"):
                 return
@@ -113,6 +140,9 @@ class TeamsNotesGUI:
     def on_stop(self):
         self.log("Stopping… finishing capture and processing")
         self.stop_event.set()
+        if self.audio_capture:
+            # Release the worker blocked waiting for audio
+            self.audio_capture.wake()
         self.btn_stop.config(state=tk.DISABLED)
 
     def _run_workflow(self, participants):
@@ -122,13 +152,16 @@ class TeamsNotesGUI:
             self.log("Failed to start audio capture")
             self._reset_buttons()
             return
+        self.audio_capture = audio_capture
 
-        # Capture loop
+        # Capture loop: blocks until audio is written or Stop wakes it
         while not self.stop_event.is_set():
-            audio_capture.capture_chunk()
-            time.sleep(0.1)
+            if not audio_capture.read_next_chunk():
+                self.log("Audio capture ended unexpectedly")
+                break
 
         # Stop and save
+        self.audio_capture = None
         audio_capture.stop_capture()
         audio_file = audio_capture.save_audio()
         audio_capture.cleanup()
@@ -142,7 +175,7 @@ class TeamsNotesGUI:
         try:
             self.log("Transcribing audio…")
             transcriber = get_transcriber()
-            transcription = transcriber.transcribe_file(audio_file)
+            transcription = transcriber.transcribe_file_parallel(audio_file)
         except Exception as e:
             self.log(f"Transcription error: {e}")
             self._reset_buttons()
@@ -179,6 +212,7 @@ class TeamsNotesGUI:
                 notes_file_path=notes_file,
                 message_body=self.var_message.get() or None,
             )
+            sender.close()
             if ok:
                 self.log("Email sent successfully.")
             else:
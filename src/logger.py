@@ -1,15 +1,44 @@
 """Logging configuration module"""
 
+import atexit
 import logging
 import logging.handlers
+import queue
 from pathlib import Path
 from src.config import Config
 
 
+# One queue per log file, drained by a background QueueListener that owns the
+# RotatingFileHandler: callers only enqueue records, and the file writes and
+# rotation happen off the capture/GUI threads
+_file_queues = {}
+
+
+def _file_queue(log_file, formatter):
+    """Return the queue feeding the background writer for log_file"""
+    key = str(log_file.resolve())
+    if key not in _file_queues:
+        file_handler = logging.handlers.RotatingFileHandler(
+            str(log_file),
+            maxBytes=10485760,  # 10MB
+            backupCount=5
+        )
+        file_handler.setFormatter(formatter)
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, file_handler)
+        listener.start()
+        # Flush whatever is still queued when the process exits
+        atexit.register(listener.stop)
+        _file_queues[key] = log_queue
+    return _file_queues[key]
+
+
 def setup_logger(name, log_file=None, level=None):
     """
     Set up logger with both file and console handlers
     
+    Calling it again for the same name returns the existing logger. File output goes through a queue to a background thread; see _file_queue.
+    
     Args:
         name (str): Logger name
         log_file (str): Path to log file. If None, uses Config.OUTPUT_DIRECTORY/app.log
@@ -18,6 +47,11 @@ def setup_logger(name, log_file=None, level=None):
     Returns:
         logging.Logger: Configured logger
     """
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        # Already configured by an earlier call
+        return logger
+    
     if level is None:
         level = Config.LOG_LEVEL
     
@@ -29,8 +63,9 @@ def setup_logger(name, log_file=None, level=None):
     # Ensure log directory exists
     log_file.parent.mkdir(parents=True, exist_ok=True)
     
-    logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level))
+    # Handlers are attached here; don't emit again through parent loggers
+    logger.propagate = False
     
     # Create formatters
     formatter = logging.Formatter(
@@ -38,14 +73,8 @@ def setup_logger(name, log_file=None, level=None):
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    # File handler
-    file_handler = logging.handlers.RotatingFileHandler(
-        str(log_file),
-        maxBytes=10485760,  # 10MB
-        backupCount=5
-    )
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    # File handler (non-blocking, written by the queue listener)
+    logger.addHandler(logging.handlers.QueueHandler(_file_queue(log_file, formatter)))
     
     # Console handler
     console_handler = logging.StreamHandler()
@@ -53,7 +82,3 @@ def setup_logger(name, log_file=None, level=None):
     logger.addHandler(console_handler)
     
     return logger
-
-
-# Create root logger
-root_logger = setup_logger('teams_notes')
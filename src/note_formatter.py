@@ -1,15 +1,60 @@
 """Meeting notes formatting module"""
 
+import copy
 import logging
+import re
 from datetime import datetime
 from pathlib import Path
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
 from src.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Sentence boundary: whitespace following terminal punctuation
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+# Key points taken from the start of the transcript
+KEY_POINT_LIMIT = 10
+# Sentences per paragraph when a transcript has no paragraph breaks
+SENTENCES_PER_PARAGRAPH = 5
+
+
+def _iter_sentences(text):
+    """Yield stripped sentences, scanning only as far as the caller reads"""
+    pos = 0
+    while True:
+        match = _SENT_RE.search(text, pos)
+        end = match.start() if match else len(text)
+        sentence = text[pos:end].strip()
+        if sentence:
+            yield sentence
+        if match is None:
+            return
+        pos = match.end()
+
+
+def _iter_paragraphs(text):
+    """Yield transcript paragraphs: blank-line separated blocks if present,
+    otherwise runs of SENTENCES_PER_PARAGRAPH sentences"""
+    if '\n\n' in text:
+        for block in text.split('\n\n'):
+            block = block.strip()
+            if block:
+                yield block
+        return
+
+    group = []
+    for sentence in _iter_sentences(text):
+        group.append(sentence)
+        if len(group) == SENTENCES_PER_PARAGRAPH:
+            yield " ".join(group)
+            group = []
+    if group:
+        yield " ".join(group)
+
 
 class MeetingNoteFormatter:
     """Format and structure meeting notes"""
@@ -61,6 +106,44 @@ class MeetingNoteFormatter:
         """Add a numbered point"""
         self.doc.add_paragraph(text, style=f'List Number' if level == 0 else f'List Number {level + 1}')
     
+    def _bulk_append(self, items, style):
+        """
+        Append one styled paragraph per item in a single body mutation
+        
+        Builds the ``w:p`` elements directly instead of going through
+        add_paragraph, so the style is resolved once rather than per item.
+        
+        Args:
+            items (iterable): Paragraph texts
+            style (str): Paragraph style name, e.g. 'List Bullet'
+        """
+        template = OxmlElement('w:p')
+        p_pr = OxmlElement('w:pPr')
+        p_style = OxmlElement('w:pStyle')
+        p_style.set(qn('w:val'), self.doc.styles[style].style_id)
+        p_pr.append(p_style)
+        template.append(p_pr)
+        
+        paragraphs = []
+        for text in items:
+            paragraph = copy.deepcopy(template)
+            run = OxmlElement('w:r')
+            for idx, line in enumerate(str(text).split('\n')):
+                if idx:
+                    run.append(OxmlElement('w:br'))
+                text_el = OxmlElement('w:t')
+                text_el.set(qn('xml:space'), 'preserve')
+                text_el.text = line
+                run.append(text_el)
+            paragraph.append(run)
+            paragraphs.append(paragraph)
+        
+        # Keep the section properties as the last child of the body
+        body = self.doc.element.body
+        sect_pr = body.sectPr
+        pos = body.index(sect_pr) if sect_pr is not None else len(body)
+        body[pos:pos] = paragraphs
+    
     def add_table(self, rows, cols, data=None):
         """
         Add a table to the document
@@ -91,20 +174,31 @@ class MeetingNoteFormatter:
         """
         self.add_section("Meeting Summary")
         
-        # Split text into sentences and add as bullet points
-        sentences = [s.strip() for s in transcription_text.split('.') if s.strip()]
-        
-        for sentence in sentences[:10]:  # Limit to first 10 sentences as key points
-            if len(sentence) > 20:  # Filter out very short fragments
-                self.add_bullet_point(sentence + ".")
+        # Scan lazily and stop once enough key points are found, so long
+        # transcripts are never fully tokenized
+        sentences = _iter_sentences(transcription_text)
+        key_points = []
+        for sentence in sentences:
+            if len(sentence) <= 20:  # Filter out very short fragments
+                continue
+            if sentence[-1] not in '.!?':
+                sentence += "."
+            key_points.append(sentence)
+            if len(key_points) == KEY_POINT_LIMIT:
+                break
+        self._bulk_append(key_points, 'List Bullet')
         
-        if len(sentences) > 10:
-            self.add_paragraph(f"\n... ({len(sentences) - 10} more points in full transcription)")
+        if len(key_points) == KEY_POINT_LIMIT and next(sentences, None) is not None:
+            self.add_paragraph("\n... (more points in full transcription)")
     
     def add_full_transcription(self, transcription_text):
-        """Add full transcription to document"""
+        """Add full transcription to document
+        
+        The text is written as a series of short paragraphs rather than one
+        run holding the whole transcript, which also reads better in Word.
+        """
         self.add_section("Full Transcription")
-        self.add_text(transcription_text)
+        self._bulk_append(_iter_paragraphs(transcription_text), 'Normal')
     
     def add_action_items(self, items=None):
         """
@@ -116,8 +210,7 @@ class MeetingNoteFormatter:
         self.add_section("Action Items")
         
         if items:
-            for idx, item in enumerate(items, 1):
-                self.add_numbered_point(item)
+            self._bulk_append(items, 'List Number')
         else:
             self.add_text("No specific action items identified from this meeting.")
     
@@ -156,7 +249,7 @@ class MeetingNoteFormatter:
             filename = f"meeting_notes_{timestamp}.docx"
         
         try:
-            filepath = Path(Config.OUTPUT_DIRECTORY) / filename
+            filepath = Path(Config.ensure_output_directory()) / filename
             self.doc.save(str(filepath))
             logger.info(f"Meeting notes saved to {filepath}")
             return str(filepath)
@@ -0,0 +1,33 @@
+"""PCM sample kernels used on the audio callback path
+
+The kernels are compiled with Numba when it is installed (optional
+dependency); otherwise an equivalent NumPy implementation is used.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit  # type: ignore
+except Exception:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True)
+    def downmix_stereo_i16(block, out):
+        """Average the first two channels of an int16 (frames, channels) block into ``out``"""
+        # Single fused pass: widen, add, halve and narrow without temporaries
+        for i in range(block.shape[0]):
+            out[i] = (np.int32(block[i, 0]) + np.int32(block[i, 1])) >> 1
+        return out
+else:
+    def downmix_stereo_i16(block, out):
+        """Average the first two channels of an int16 (frames, channels) block into ``out``"""
+        np.right_shift(block[:, 0].astype(np.int32) + block[:, 1], 1, out=out, casting='unsafe')
+        return out
+
+
+def warm_up():
+    """Trigger JIT compilation before the first audio callback needs the kernel"""
+    block = np.zeros((2, 2), dtype=np.int16)
+    downmix_stereo_i16(block, np.empty(2, dtype=np.int16))
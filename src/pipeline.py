@@ -1,7 +1,16 @@
 """Main pipeline orchestration module"""
 
+import hashlib
 import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
 from src.audio_capture import AudioCapture
+from src.config import Config
 from src.transcription import get_transcriber
 from src.note_formatter import MeetingNoteFormatter
 from src.email_sender import EmailSender
@@ -13,16 +22,18 @@ logger = setup_logger('teams_notes.pipeline')
 class MeetingPipeline:
     """Orchestrate the entire meeting capture and notes distribution pipeline"""
     
-    def __init__(self, meeting_title="Team Meeting", participants=None):
+    def __init__(self, meeting_title="Team Meeting", participants=None, use_transcript_cache=True):
         """
         Initialize the pipeline
         
         Args:
             meeting_title (str): Title of the meeting
             participants (list): List of participant emails
+            use_transcript_cache (bool): Reuse cached transcripts for identical audio
         """
         self.meeting_title = meeting_title
         self.participants = participants or []
+        self.use_transcript_cache = use_transcript_cache
         self.audio_file = None
         self.transcription = None
         self.notes_file = None
@@ -42,34 +53,51 @@ class MeetingPipeline:
         
         audio_capture = AudioCapture()
         
-        if not audio_capture.start_capture():
+        # A known duration lets the WAV header be written with its final size
+        expected_frames = duration_seconds * AudioCapture.RATE if duration_seconds else None
+        if not audio_capture.start_capture(expected_frames=expected_frames):
             logger.error("Failed to start audio capture")
             return None
         
+        stop = threading.Event()
+        timer = None
+        
+        def stop_capture_loop():
+            stop.set()
+            audio_capture.wake()
+        
         try:
             if duration_seconds:
-                import time
                 logger.info(f"Capturing for {duration_seconds} seconds...")
-                for _ in range(duration_seconds * 10):  # 100ms chunks
-                    audio_capture.capture_chunk()
-                    time.sleep(0.1)
+                # Capture normally ends once expected_frames are written; the
+                # timer only fires if the stream stalls. The grace period
+                # covers stream start-up before the first block arrives
+                timer = threading.Timer(duration_seconds + 2, stop_capture_loop)
+                timer.daemon = True
+                timer.start()
             else:
                 logger.info("Audio capture in progress. Press Ctrl+C to stop.")
-                while True:
-                    audio_capture.capture_chunk()
+            # Bounded wait so Ctrl+C is still delivered on Windows
+            while not stop.is_set() and audio_capture.read_next_chunk(timeout=1):
+                pass
         except KeyboardInterrupt:
             logger.info("Audio capture stopped by user")
         finally:
+            if timer is not None:
+                timer.cancel()
             audio_capture.stop_capture()
             self.audio_file = audio_capture.save_audio()
             audio_capture.cleanup()
         
         return self.audio_file
     
-    def transcribe_audio(self):
+    def transcribe_audio(self, transcriber=None):
         """
         Transcribe captured audio
         
+        Args:
+            transcriber (BaseTranscriber): Prebuilt transcriber; created if None
+            
         Returns:
             str: Transcription text or None
         """
@@ -78,8 +106,9 @@ class MeetingPipeline:
             return None
         
         logger.info("Starting transcription...")
-        transcriber = get_transcriber()
-        self.transcription = transcriber.transcribe_file(self.audio_file)
+        if transcriber is None:
+            transcriber = get_transcriber(use_cache=self.use_transcript_cache)
+        self.transcription = transcriber.transcribe_file_parallel(self.audio_file)
         
         if self.transcription:
             logger.info("Transcription completed successfully")
@@ -93,6 +122,8 @@ class MeetingPipeline:
         """
         Format transcription into professional meeting notes
         
+        The transcription is released once the notes are saved.
+        
         Args:
             include_full_transcription (bool): Include full transcription in notes
             action_items (list): Optional list of action items to include
@@ -104,6 +135,13 @@ class MeetingPipeline:
             logger.error("No transcription available. Transcribe audio first.")
             return None
         
+        cache_path = None
+        if not Config.NOTES_NO_CACHE:
+            cache_path = self._notes_cache_path(include_full_transcription, action_items)
+            if (cache_path.is_file() and not self._notes_cache_expired(cache_path, time.time())
+                    and self._reuse_cached_notes(cache_path)):
+                return self.notes_file
+        
         logger.info("Formatting meeting notes...")
         
         formatter = MeetingNoteFormatter(
@@ -122,18 +160,82 @@ class MeetingPipeline:
         self.notes_file = formatter.save()
         
         if self.notes_file:
+            # The notes document now holds the text; release the large string
+            self.transcription = None
             logger.info(f"Meeting notes saved: {self.notes_file}")
+            if cache_path is not None:
+                self._store_cached_notes(cache_path)
         else:
             logger.error("Failed to save meeting notes")
         
         return self.notes_file
     
-    def send_notes(self, custom_message=None):
+    def _notes_cache_path(self, include_full_transcription, action_items):
+        """Cache location for notes built from the current inputs"""
+        digest = hashlib.sha256(repr((
+            self.meeting_title, tuple(self.participants),
+            include_full_transcription, tuple(action_items or ())
+        )).encode('utf-8'))
+        # Hashed separately so the transcript is not copied into a repr
+        digest.update(self.transcription.encode('utf-8'))
+        return Path(Config.OUTPUT_DIRECTORY) / '.notes_cache' / f"{digest.hexdigest()}.docx"
+    
+    def _reuse_cached_notes(self, cache_path):
+        """Copy previously generated notes into place instead of rebuilding them"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        target = Path(Config.ensure_output_directory()) / f"meeting_notes_{timestamp}.docx"
+        try:
+            shutil.copy(cache_path, target)
+        except OSError as e:
+            logger.warning(f"Could not reuse cached notes: {e}")
+            return False
+        self.notes_file = str(target)
+        self.transcription = None
+        logger.info(f"Reused cached meeting notes: {self.notes_file}")
+        return True
+    
+    @staticmethod
+    def _notes_cache_expired(path, now):
+        ttl_seconds = Config.NOTES_CACHE_TTL_DAYS * 86400
+        return ttl_seconds > 0 and now - path.stat().st_mtime > ttl_seconds
+    
+    def _evict_expired_notes(self, cache_dir):
+        """Delete cached documents older than NOTES_CACHE_TTL_DAYS"""
+        now = time.time()
+        for path in cache_dir.glob('*.docx'):
+            try:
+                if self._notes_cache_expired(path, now):
+                    path.unlink()
+            except OSError:
+                pass
+    
+    def _store_cached_notes(self, cache_path):
+        """Keep a copy of the saved notes for reruns with the same inputs"""
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._evict_expired_notes(cache_path.parent)
+            shutil.copy(self.notes_file, tmp_path)
+            # Atomic, so a concurrent run never sees a half-written document
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache meeting notes: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    def _uses_send_pool(self, concurrency):
+        """Check whether send_notes will fan out over a worker pool"""
+        return concurrency > 1 and len(self.participants) > EmailSender.POOL_THRESHOLD
+    
+    def send_notes(self, custom_message=None, concurrency=4, email_sender=None):
         """
         Send meeting notes to participants
         
         Args:
             custom_message (str): Optional custom message to include in email
+            concurrency (int): SMTP connections to spread large participant
+                               lists over (capped at Config.EMAIL_MAX_CONCURRENCY)
+            email_sender (EmailSender): Sender to use, e.g. one already connected;
+                                       closed once the notes are sent
             
         Returns:
             bool: True if email sent successfully, False otherwise
@@ -148,13 +250,32 @@ class MeetingPipeline:
         
         logger.info(f"Sending meeting notes to {len(self.participants)} participant(s)...")
         
-        email_sender = EmailSender()
-        success = email_sender.send_meeting_notes(
-            recipient_emails=self.participants,
-            meeting_title=self.meeting_title,
-            notes_file_path=self.notes_file,
-            message_body=custom_message
-        )
+        email_sender = email_sender or EmailSender()
+        try:
+            if self._uses_send_pool(concurrency):
+                # Worker pool, one connection per worker
+                success = email_sender.send_meeting_notes(
+                    recipient_emails=self.participants,
+                    meeting_title=self.meeting_title,
+                    notes_file_path=self.notes_file,
+                    message_body=custom_message,
+                    concurrency=concurrency
+                )
+            else:
+                # One login for the whole participant list
+                with email_sender.open_session() as session:
+                    success = email_sender.send_meeting_notes(
+                        recipient_emails=self.participants,
+                        meeting_title=self.meeting_title,
+                        notes_file_path=self.notes_file,
+                        message_body=custom_message,
+                        session=session
+                    )
+        except Exception as e:
+            logger.error(f"Could not open SMTP session: {e}")
+            success = False
+        finally:
+            email_sender.close()
         
         if success:
             logger.info("Meeting notes sent successfully")
@@ -163,7 +284,8 @@ class MeetingPipeline:
         
         return success
     
-    def run_full_pipeline(self, duration_seconds=None, action_items=None, custom_message=None):
+    def run_full_pipeline(self, duration_seconds=None, action_items=None, custom_message=None,
+                          email_concurrency=4, audio_file=None):
         """
         Run the complete pipeline from capture to distribution
         
@@ -171,6 +293,8 @@ class MeetingPipeline:
             duration_seconds (int): Duration to capture (for testing)
             action_items (list): Optional action items to include
             custom_message (str): Optional custom email message
+            email_concurrency (int): Parallel SMTP connections for large participant lists
+            audio_file (str): Existing recording to process instead of capturing audio
             
         Returns:
             bool: True if all steps completed successfully
@@ -179,21 +303,48 @@ class MeetingPipeline:
         logger.info("Starting Teams Meeting Notes Pipeline")
         logger.info("="*50)
         
-        # Step 1: Capture audio
-        if not self.capture_audio(duration_seconds):
-            return False
-        
-        # Step 2: Transcribe
-        if not self.transcribe_audio():
-            return False
-        
-        # Step 3: Format notes
-        if not self.format_notes(action_items=action_items):
-            return False
-        
-        # Step 4: Send notes
-        if not self.send_notes(custom_message):
-            return False
+        # The stages consume each other's output, but their setup does not:
+        # the transcriber (SDK import, model load) is built during capture and
+        # the SMTP login happens while the notes are formatted. The login waits
+        # until after transcription, which can outlast the server's idle timeout
+        prep = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pipeline-prep')
+        email_sender = EmailSender()
+        warm_up = None
+        try:
+            transcriber = prep.submit(get_transcriber, use_cache=self.use_transcript_cache)
+            
+            # Step 1: Capture audio, or reuse an earlier recording
+            if audio_file is not None:
+                if not Path(audio_file).is_file():
+                    logger.error(f"Audio file not found: {audio_file}")
+                    return False
+                self.audio_file = str(audio_file)
+                logger.info(f"Using existing recording: {self.audio_file}")
+            elif not self.capture_audio(duration_seconds):
+                return False
+            
+            # Step 2: Transcribe
+            if not self.transcribe_audio(transcriber.result()):
+                return False
+            
+            if self.participants and not self._uses_send_pool(email_concurrency):
+                warm_up = prep.submit(email_sender.warm_up)
+            
+            # Step 3: Format notes
+            if not self.format_notes(action_items=action_items):
+                return False
+            
+            # Step 4: Send notes
+            if not self.send_notes(custom_message, concurrency=email_concurrency,
+                                   email_sender=email_sender):
+                return False
+        finally:
+            prep.shutdown(wait=False, cancel_futures=True)
+            if warm_up is not None and not warm_up.cancelled():
+                # A login still in flight would otherwise reopen the
+                # connection after close() and leak it
+                warm_up.result()
+            email_sender.close()
         
         logger.info("="*50)
         logger.info("Pipeline completed successfully!")
@@ -1,22 +1,193 @@
 """Transcription module with provider adapters (Azure, local Whisper, mock)"""
 
+import hashlib
+import json
 import logging
+import os
+import random
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from src.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Silence-based segmentation used for parallel transcription
+SEGMENT_MIN_SECONDS = 30
+SEGMENT_MAX_SECONDS = 60
+SILENCE_FRAME_MS = 30
+SILENCE_RMS_THRESHOLD = 500  # int16 RMS below which a frame counts as silence
+VAD_AGGRESSIVENESS = 2  # webrtcvad mode, 0 (keeps most audio as speech) to 3
+
+
+def _rms_silence_detector():
+    """Frame predicate: RMS of the int16 samples below SILENCE_RMS_THRESHOLD"""
+    import numpy as np  # type: ignore
+
+    def is_silent(frame):
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        return np.sqrt(np.mean(samples * samples)) < SILENCE_RMS_THRESHOLD
+    return is_silent
+
+
+def _vad_silence_detector(params):
+    """Frame predicate backed by webrtcvad
+
+    Returns None when webrtcvad is not installed or the audio is not mono at
+    a rate it supports.
+    """
+    try:
+        import webrtcvad  # type: ignore
+    except Exception:
+        return None
+    if params.nchannels != 1 or params.framerate not in (8000, 16000, 32000, 48000):
+        return None
+
+    vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+    frame_bytes = params.framerate * SILENCE_FRAME_MS // 1000 * params.sampwidth
+
+    def is_silent(frame):
+        # The VAD only accepts whole frames; a short tail counts as speech
+        return len(frame) == frame_bytes and not vad.is_speech(frame, params.framerate)
+    return is_silent
+
+
+def split_audio_vad(wav_path, output_dir, min_seconds=SEGMENT_MIN_SECONDS,
+                    max_seconds=SEGMENT_MAX_SECONDS):
+    """Split a 16-bit PCM WAV file at pauses found by voice activity detection
+
+    A segment is closed at the first silent frame once it is at least
+    ``min_seconds`` long, or unconditionally at ``max_seconds``. The audio is
+    streamed frame by frame, so memory use does not grow with the recording.
+
+    A frame counts as silent when webrtcvad finds no speech in it, which holds
+    up better than an energy threshold against background noise. Falls back
+    to an RMS check when webrtcvad is not installed or the format is
+    unsupported.
+
+    Args:
+        wav_path (str): Path to the WAV file
+        output_dir (str): Directory to write the segment files into
+
+    Returns:
+        list: (start_seconds, end_seconds, path) tuples in playback order, or
+              an empty list if the file is not 16-bit PCM WAV
+    """
+    with wave.open(str(wav_path), 'rb') as src:
+        if src.getsampwidth() != 2:
+            return []
+        params = src.getparams()
+        rate = src.getframerate()
+        is_silent = _vad_silence_detector(params) or _rms_silence_detector()
+        frame_len = rate * SILENCE_FRAME_MS // 1000
+        min_frames = min_seconds * rate
+        max_frames = max_seconds * rate
+
+        segments = []
+        writer = None
+        start = 0
+        written = 0
+        while True:
+            frame = src.readframes(frame_len)
+            if not frame:
+                break
+            if writer is None:
+                path = Path(output_dir) / f"segment_{len(segments):04d}.wav"
+                writer = wave.open(str(path), 'wb')
+                writer.setparams(params)
+                segments.append([start / rate, None, str(path)])
+                written = 0
+            writer.writeframes(frame)
+            written += len(frame) // (2 * params.nchannels)
+
+            if written >= min_frames and (written >= max_frames or is_silent(frame)):
+                writer.close()
+                writer = None
+                start += written
+                segments[-1][1] = start / rate
+        if writer is not None:
+            writer.close()
+            segments[-1][1] = (start + written) / rate
+
+    return [tuple(segment) for segment in segments]
+
 
 class BaseTranscriber:
     """Interface for transcribers"""
 
+    # Whether independent segments can be sent to the provider concurrently
+    supports_parallel = False
+
+    @property
+    def model_id(self):
+        """Identifies the model/settings producing the text, for cache keys"""
+        return type(self).__name__
+
     def transcribe_file(self, audio_file_path):
         raise NotImplementedError()
 
+    def transcribe_file_parallel(self, audio_file_path, max_concurrency=None):
+        """Transcribe long audio as silence-delimited segments in parallel
+
+        Segments are cut at pauses found by split_audio_vad. Falls back to
+        ``transcribe_file`` for providers that do not support concurrent
+        requests, for non-WAV input, or when the audio fits in a single
+        segment.
+
+        Args:
+            audio_file_path (str): Path to the audio file
+            max_concurrency (int): Maximum concurrent requests.
+                                   Defaults to Config.TRANSCRIBE_MAX_CONCURRENCY
+
+        Returns:
+            str: Transcription text or None
+        """
+        if max_concurrency is None:
+            max_concurrency = Config.TRANSCRIBE_MAX_CONCURRENCY
+        if (not self.supports_parallel or max_concurrency < 2
+                or Path(audio_file_path).suffix.lower() != '.wav'):
+            return self.transcribe_file(audio_file_path)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            try:
+                segments = split_audio_vad(audio_file_path, tmp_dir)
+            except Exception as e:
+                logger.warning("Could not split audio for parallel transcription: %s", e)
+                segments = []
+            if len(segments) < 2:
+                return self.transcribe_file(audio_file_path)
+            # Results are joined in playback order
+            segments = [path for _start, _end, path in sorted(segments)]
+
+            logger.info("Transcribing %d segments with up to %d concurrent requests",
+                        len(segments), max_concurrency)
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(segments))) as pool:
+                texts = list(pool.map(self.transcribe_file, segments))
+
+        if any(text is None for text in texts):
+            logger.error("Transcription failed for %d of %d segments",
+                         sum(text is None for text in texts), len(texts))
+            return None
+        return ' '.join(text.strip() for text in texts if text)
+
 
 class AzureTranscriber(BaseTranscriber):
     """Azure Cognitive Services transcriber"""
 
+    supports_parallel = True
+    # Retries when the subscription's concurrency limit is hit (HTTP 429)
+    MAX_RETRIES = 5
+    MAX_BACKOFF_SECONDS = 30
+    # PCM pushed to the recognizer per write
+    STREAM_CHUNK_BYTES = 32 * 1024
+    # Wait for the session to end at most this many times the audio length,
+    # plus a fixed allowance for connection setup and the final result
+    RECOGNITION_TIMEOUT_FACTOR = 2
+    RECOGNITION_TIMEOUT_SECONDS = 60
+
     def __init__(self):
         try:
             import azure.cognitiveservices.speech as speechsdk
@@ -31,50 +202,206 @@ class AzureTranscriber(BaseTranscriber):
         )
         self.speech_config.speech_recognition_language = "en-US"
 
+    @property
+    def model_id(self):
+        return f"azure:{Config.AZURE_SPEECH_REGION}:{self.speech_config.speech_recognition_language}"
+
     def transcribe_file(self, audio_file_path):
         if not Path(audio_file_path).exists():
             logger.error("Audio file not found: %s", audio_file_path)
             return None
 
-        try:
-            audio_config = self.speechsdk.audio.AudioConfig(filename=audio_file_path)
-            recognizer = self.speechsdk.SpeechRecognizer(
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                logger.info("Transcribing audio file with Azure: %s", audio_file_path)
+                text, cancellation = self._recognize_continuous(audio_file_path)
+            except Exception as e:
+                logger.error("Transcription error: %s", e)
+                return None
+
+            if cancellation is None:
+                if text:
+                    logger.info("Transcription completed successfully")
+                else:
+                    logger.warning("No speech could be recognized from the audio")
+                return text
+            if self._is_throttled(cancellation) and attempt < self.MAX_RETRIES:
+                delay = min(2 ** attempt, self.MAX_BACKOFF_SECONDS) + random.random()
+                logger.warning("Azure request throttled; retrying in %.1fs", delay)
+                time.sleep(delay)
+                continue
+            logger.error("Transcription canceled: %s", cancellation.reason)
+            logger.error("Error details: %s", cancellation.error_details)
+            return None
+
+    def _recognize_continuous(self, audio_file_path):
+        """Stream a WAV file to Azure and collect every recognized utterance
+
+        recognize_once() stops after the first utterance (at most ~15 s), so
+        the PCM frames are pushed through a PushAudioInputStream while
+        continuous recognition reports results as they are produced.
+
+        Returns:
+            tuple: (text, cancellation) where cancellation holds the details
+                   of an error cancel, or None if the session ended normally
+
+        Raises:
+            TimeoutError: If the session neither stops nor is canceled within
+                          the time allowed for the audio's length
+        """
+        speechsdk = self.speechsdk
+        texts = []
+        errors = []
+        done = threading.Event()
+
+        def on_recognized(evt):
+            if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech and evt.result.text:
+                texts.append(evt.result.text)
+
+        def on_canceled(evt):
+            # End of stream also arrives as a cancel; only errors count
+            if evt.cancellation_details.reason == speechsdk.CancellationReason.Error:
+                errors.append(evt.cancellation_details)
+            done.set()
+
+        with wave.open(str(audio_file_path), 'rb') as wf:
+            stream_format = speechsdk.audio.AudioStreamFormat(
+                samples_per_second=wf.getframerate(),
+                bits_per_sample=wf.getsampwidth() * 8,
+                channels=wf.getnchannels()
+            )
+            push_stream = speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+            recognizer = speechsdk.SpeechRecognizer(
                 speech_config=self.speech_config,
-                audio_config=audio_config
+                audio_config=speechsdk.audio.AudioConfig(stream=push_stream)
             )
+            recognizer.recognized.connect(on_recognized)
+            recognizer.canceled.connect(on_canceled)
+            recognizer.session_stopped.connect(lambda evt: done.set())
 
-            logger.info("Transcribing audio file with Azure: %s", audio_file_path)
-            result = recognizer.recognize_once()
-
-            if result.reason == self.speechsdk.ResultReason.RecognizedSpeech:
-                logger.info("Transcription completed successfully")
-                return result.text
-            elif result.reason == self.speechsdk.ResultReason.NoMatch:
-                logger.warning("No speech could be recognized from the audio")
-                return ""
-            elif result.reason == self.speechsdk.ResultReason.Canceled:
-                cancellation = result.cancellation_details
-                logger.error("Transcription canceled: %s", cancellation.reason)
-                logger.error("Error details: %s", cancellation.error_details)
-                return None
-        except Exception as e:
-            logger.error("Transcription error: %s", e)
-            return None
+            timeout = (wf.getnframes() / wf.getframerate() * self.RECOGNITION_TIMEOUT_FACTOR
+                       + self.RECOGNITION_TIMEOUT_SECONDS)
+
+            recognizer.start_continuous_recognition_async().get()
+            try:
+                try:
+                    frames_per_chunk = max(self.STREAM_CHUNK_BYTES // (wf.getsampwidth() * wf.getnchannels()), 1)
+                    while not done.is_set():
+                        chunk = wf.readframes(frames_per_chunk)
+                        if not chunk:
+                            break
+                        push_stream.write(chunk)
+                finally:
+                    # Signals end of stream; the session stops once the tail is recognized
+                    push_stream.close()
+                if not done.wait(timeout):
+                    raise TimeoutError(f"Azure recognition did not finish within {timeout:.0f}s")
+            finally:
+                try:
+                    recognizer.stop_continuous_recognition_async().get()
+                except Exception as e:
+                    logger.warning("Could not stop Azure recognition: %s", e)
+
+        return " ".join(texts), (errors[0] if errors else None)
+
+    def _is_throttled(self, cancellation):
+        """Whether a cancellation was caused by too many concurrent requests"""
+        code = getattr(cancellation, 'code', None)
+        if code is not None and code == self.speechsdk.CancellationErrorCode.TooManyRequests:
+            return True
+        return 'too many requests' in (cancellation.error_details or '').lower()
+
+
+def _torch_cuda_available():
+    try:
+        import torch
+    except Exception:
+        return False
+    return torch.cuda.is_available()
+
+
+def _ctranslate2_cuda_available():
+    import ctranslate2
+    return ctranslate2.get_cuda_device_count() > 0
+
+
+def _whisper_device(cuda_available):
+    """Resolve Config.WHISPER_DEVICE; 'auto' uses CUDA when cuda_available() says so"""
+    device = (Config.WHISPER_DEVICE or 'auto').lower()
+    if device == 'auto':
+        return 'cuda' if cuda_available() else 'cpu'
+    return device
+
+
+def _whisper_compute_type(device):
+    """Resolve Config.WHISPER_COMPUTE_TYPE; 'auto' is float16 on GPU, int8 on CPU"""
+    compute_type = (Config.WHISPER_COMPUTE_TYPE or 'auto').lower()
+    if compute_type == 'auto':
+        return 'float16' if device == 'cuda' else 'int8'
+    return compute_type
 
 
 class WhisperLocalTranscriber(BaseTranscriber):
-    """Local Whisper-based transcriber (optional dependency)"""
+    """Local Whisper-based transcriber (optional dependency)
+
+    Uses faster-whisper (CTranslate2, quantized) when it is installed and
+    falls back to openai-whisper otherwise.
+    """
+
+    # Loaded (backend, model, compute_type) by model name, shared by every
+    # instance in the process
+    _model_cache = {}
+    _model_lock = threading.Lock()
+
+    def __init__(self, model_name=None):
+        self.model_name = model_name or Config.WHISPER_MODEL
+        self.backend, self.model, self.compute_type = self.load_model(self.model_name)
+
+    @classmethod
+    def load_model(cls, model_name=None):
+        """Load a Whisper model once per process
+
+        Args:
+            model_name (str): Model size, e.g. 'small'. Defaults to Config.WHISPER_MODEL
+
+        Returns:
+            tuple: (backend, model, compute_type) where backend is
+                   'faster_whisper' or 'whisper'
+        """
+        model_name = model_name or Config.WHISPER_MODEL
+        with cls._model_lock:
+            if model_name not in cls._model_cache:
+                cls._model_cache[model_name] = cls._load(model_name)
+            return cls._model_cache[model_name]
+
+    @staticmethod
+    def _load(model_name):
+        try:
+            from faster_whisper import WhisperModel
+        except Exception:
+            WhisperModel = None
+
+        if WhisperModel is not None:
+            device = _whisper_device(_ctranslate2_cuda_available)
+            compute_type = _whisper_compute_type(device)
+            logger.info("Loading faster-whisper model '%s' on %s (%s)", model_name, device, compute_type)
+            model = WhisperModel(model_name, device=device, compute_type=compute_type)
+            return 'faster_whisper', model, compute_type
 
-    def __init__(self):
         try:
             import whisper
         except Exception as e:
             logger.error("Whisper package not available: %s", e)
             raise
+        device = _whisper_device(_torch_cuda_available)
+        logger.info("Loading Whisper model '%s' on %s", model_name, device)
+        return 'whisper', whisper.load_model(model_name, device=device), None
 
-        self.whisper = whisper
-        # Load default model; for production consider model selection
-        self.model = whisper.load_model("small")
+    @property
+    def model_id(self):
+        if self.backend == 'faster_whisper':
+            return f"faster-whisper:{self.model_name}:{self.compute_type}"
+        return f"whisper:{self.model_name}"
 
     def transcribe_file(self, audio_file_path):
         if not Path(audio_file_path).exists():
@@ -83,6 +410,10 @@ class WhisperLocalTranscriber(BaseTranscriber):
 
         try:
             logger.info("Transcribing audio file with local Whisper: %s", audio_file_path)
+            if self.backend == 'faster_whisper':
+                # Segments are generated lazily as decoding proceeds
+                segments, _info = self.model.transcribe(str(audio_file_path))
+                return " ".join(segment.text.strip() for segment in segments)
             result = self.model.transcribe(str(audio_file_path))
             return result.get('text', '')
         except Exception as e:
@@ -98,7 +429,119 @@ class MockTranscriber(BaseTranscriber):
         return "[Mock transcription] This is placeholder text for testing."
 
 
-def get_transcriber():
+class CachedTranscriber(BaseTranscriber):
+    """Disk cache in front of another transcriber, keyed by audio content and model
+
+    Re-running the pipeline on the same recording (e.g. after a crash while
+    formatting or emailing) returns the stored transcript instead of calling
+    the provider again. Entries older than ``ttl_seconds`` are evicted.
+    """
+
+    HASH_CHUNK_SIZE = 1 << 20
+
+    def __init__(self, transcriber, cache_dir=None, ttl_seconds=None):
+        self.transcriber = transcriber
+        # Hashed once: a different model or language must not reuse the text
+        self.model_hash = hashlib.sha256(transcriber.model_id.encode('utf-8')).hexdigest()[:16]
+        self.cache_dir = Path(cache_dir or Path(Config.OUTPUT_DIRECTORY) / '.transcripts')
+        if ttl_seconds is None:
+            ttl_seconds = Config.TRANSCRIPT_CACHE_TTL_DAYS * 86400
+        self.ttl_seconds = ttl_seconds
+
+    def _is_expired(self, path, now):
+        return self.ttl_seconds > 0 and now - path.stat().st_mtime > self.ttl_seconds
+
+    def _evict_expired(self):
+        now = time.time()
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                if self._is_expired(path, now):
+                    path.unlink()
+            except OSError:
+                pass
+
+    def transcribe_file(self, audio_file_path):
+        return self._cached(audio_file_path, self.transcriber.transcribe_file)
+
+    def transcribe_file_parallel(self, audio_file_path, max_concurrency=None):
+        return self._cached(
+            audio_file_path,
+            lambda path: self.transcriber.transcribe_file_parallel(path, max_concurrency)
+        )
+
+    def _cached(self, audio_file_path, transcribe):
+        if not Path(audio_file_path).exists():
+            logger.error("Audio file not found: %s", audio_file_path)
+            return None
+
+        cache_file = self.cache_dir / f"{self._hash_file(audio_file_path)}_{self.model_hash}.json"
+
+        try:
+            if cache_file.exists() and not self._is_expired(cache_file, time.time()):
+                with open(cache_file, 'r', encoding='utf-8') as fp:
+                    text = json.load(fp)['text']
+                logger.info("Using cached transcription for %s", audio_file_path)
+                return text
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable transcript cache entry %s: %s", cache_file, e)
+
+        text = transcribe(audio_file_path)
+        if text is None:
+            return None
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._evict_expired()
+            # Write then rename so a crash never leaves a truncated entry
+            tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as fp:
+                json.dump({'text': text, 'model': self.transcriber.model_id}, fp)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning("Failed to write transcript cache entry %s: %s", cache_file, e)
+
+        return text
+
+    def _hash_file(self, audio_file_path):
+        """SHA-256 of the file, streamed so long recordings are never fully loaded"""
+        digest = hashlib.sha256()
+        with open(audio_file_path, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(self.HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
+def preload_transcriber():
+    """Load the configured local model ahead of the first transcription
+
+    Intended to run on a background thread at startup so the model load
+    overlaps with capture. Cloud providers have nothing to preload.
+    """
+    provider = (Config.TRANSCRIBER_PROVIDER or 'azure').lower()
+    if provider in ('whisper_local', 'whisper'):
+        try:
+            WhisperLocalTranscriber.load_model()
+        except Exception as e:
+            logger.warning("Could not preload Whisper model: %s", e)
+
+
+def get_transcriber(use_cache=True):
+    """Create the configured transcriber
+
+    Args:
+        use_cache (bool): Wrap the transcriber in the on-disk transcript cache.
+                          Always off when TRANSCRIPT_NO_CACHE is set
+
+    Returns:
+        BaseTranscriber: Transcriber instance
+    """
+    transcriber = _create_transcriber()
+    if use_cache and not Config.TRANSCRIPT_NO_CACHE and not isinstance(transcriber, MockTranscriber):
+        return CachedTranscriber(transcriber)
+    return transcriber
+
+
+def _create_transcriber():
     provider = (Config.TRANSCRIBER_PROVIDER or 'azure').lower()
     logger.info("Selecting transcriber provider: %s", provider)
 
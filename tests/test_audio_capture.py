@@ -0,0 +1,190 @@
+"""Tests for audio capture module"""
+
+import importlib.util
+import struct
+import sys
+import tempfile
+import types
+import unittest
+import wave
+from pathlib import Path
+from unittest.mock import patch
+from src.audio_capture import AudioCapture
+from src.config import Config
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+
+class FakeStream:
+    """Input stream stub whose callback is driven by the test"""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.latency = 0.1
+
+    def feed(self, block, frames):
+        self.callback(block, frames, None, 0)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakePyAudioStream(FakeStream):
+    def stop_stream(self):
+        pass
+
+    def get_input_latency(self):
+        return self.latency
+
+
+def fake_pyaudio():
+    """Module stub for PyAudio that opens mono FakePyAudioStreams"""
+    module = types.ModuleType('pyaudio')
+    module.paInt16 = 8
+    module.paContinue = 0
+
+    class PyAudio:
+        def open(self, stream_callback, **kwargs):
+            return FakePyAudioStream(stream_callback)
+
+        def terminate(self):
+            pass
+
+    module.PyAudio = PyAudio
+    return module
+
+
+def fake_sounddevice():
+    """Module stub for sounddevice whose InputStream is a FakeStream"""
+    module = types.ModuleType('sounddevice')
+    module.InputStream = lambda callback, **kwargs: FakeStream(callback)
+    return module
+
+
+class TestAudioCapture(unittest.TestCase):
+    """Test callback capture against fake backends"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def capture(self, modules, audio_format='wav'):
+        with patch.dict(sys.modules, modules):
+            capture = AudioCapture(output_dir=self.tmp.name, audio_format=audio_format)
+        self.addCleanup(capture.cleanup)
+        return capture
+
+    def read_wav(self, path):
+        with wave.open(path, 'rb') as wf:
+            self.assertEqual(wf.getnchannels(), 1)
+            frames = wf.readframes(wf.getnframes())
+        return struct.unpack(f'<{len(frames) // 2}h', frames)
+
+    def record(self, blocks, expected_frames=None):
+        """Feed 1600-frame blocks through a fake PyAudio stream and save the WAV
+
+        Returns:
+            tuple: (samples, number of times the WAV header was rewritten)
+        """
+        capture = self.capture({'pyaudio': fake_pyaudio()})
+        patch_header = wave.Wave_write._patchheader
+        with patch.object(wave.Wave_write, '_patchheader', autospec=True,
+                          side_effect=patch_header) as patched:
+            self.assertTrue(capture.start_capture(expected_frames=expected_frames))
+            for _ in range(blocks):
+                capture.stream.feed(struct.pack('<h', 1000) * 1600, 1600)
+                capture.read_next_chunk(timeout=1)
+            capture.stop_capture()
+            path = capture.save_audio()
+        return self.read_wav(path), patched.call_count
+
+    def test_pyaudio_blocks_written_until_expected_frames(self):
+        """Test that mono blocks are written and capture ends at expected_frames"""
+        capture = self.capture({'pyaudio': fake_pyaudio()})
+        self.assertTrue(capture.start_capture(expected_frames=16000))
+
+        block = struct.pack('<h', 1000) * 1600
+        for _ in range(12):
+            capture.stream.feed(block, 1600)
+        while capture.read_next_chunk(timeout=1):
+            pass
+        capture.stop_capture()
+        samples = self.read_wav(capture.save_audio())
+
+        self.assertEqual(len(samples), 16000)
+        self.assertEqual(set(samples), {1000})
+
+    def test_full_length_wav_header_never_rewritten(self):
+        """Test that a recording reaching expected_frames keeps its first header"""
+        samples, header_writes = self.record(10, expected_frames=16000)
+
+        self.assertEqual(len(samples), 16000)
+        self.assertEqual(header_writes, 0)
+
+    def test_stopped_early_wav_header_patched_once(self):
+        """Test that a short recording has its header fixed once, on close"""
+        samples, header_writes = self.record(4, expected_frames=16000)
+
+        self.assertEqual(len(samples), 6400)
+        self.assertEqual(header_writes, 1)
+
+    def test_open_ended_wav_header_patched_once(self):
+        """Test that a recording without a known length is patched once, on close"""
+        samples, header_writes = self.record(10)
+
+        self.assertEqual(len(samples), 16000)
+        self.assertEqual(header_writes, 1)
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_sounddevice_stereo_downmixed_to_mono(self):
+        """Test that stereo ndarray blocks from the callback are downmixed and written"""
+        import numpy as np
+        capture = self.capture({'pyaudio': None, 'sounddevice': fake_sounddevice()})
+        self.assertTrue(capture.start_capture(expected_frames=16000))
+
+        block = np.tile(np.array([[1000, 3000]], dtype=np.int16), (1600, 1))
+        for _ in range(10):
+            capture.stream.feed(block, 1600)
+        while capture.read_next_chunk(timeout=1):
+            pass
+        capture.stop_capture()
+        samples = self.read_wav(capture.save_audio())
+
+        self.assertEqual(len(samples), 16000)
+        self.assertEqual(set(samples), {2000})
+
+    def test_azure_provider_records_wav(self):
+        """Test that non-wav formats fall back to wav for the Azure transcriber"""
+        with patch.object(Config, 'TRANSCRIBER_PROVIDER', 'azure'):
+            capture = self.capture({'pyaudio': fake_pyaudio()}, audio_format='flac')
+        self.assertEqual(capture.audio_format, 'wav')
+
+        with patch.object(Config, 'TRANSCRIBER_PROVIDER', 'whisper_local'):
+            capture = self.capture({'pyaudio': fake_pyaudio()}, audio_format='flac')
+        self.assertEqual(capture.audio_format, 'flac')
+
+    def test_writer_failure_ends_capture(self):
+        """Test that a block the writer cannot handle stops capture instead of hanging"""
+        capture = self.capture({'pyaudio': fake_pyaudio()})
+        self.assertTrue(capture.start_capture())
+
+        capture._queue.put_nowait(object())
+        self.assertFalse(capture.read_next_chunk(timeout=5))
+        self.assertIsNotNone(capture._writer_error)
+
+        # Later blocks are still drained so the callback never blocks
+        capture.stream.feed(b'\x00\x00' * 1600, 1600)
+        capture.stop_capture()
+        self.assertTrue(capture._queue.empty())
+        self.assertIsNone(capture.save_audio())
+        self.assertFalse(any(Path(self.tmp.name).iterdir()))
+
+
+if __name__ == '__main__':
+    unittest.main()
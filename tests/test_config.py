@@ -2,8 +2,12 @@
 
 import unittest
 import os
-from unittest.mock import patch
-from src.config import Config
+import sys
+import tempfile
+import types
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from src.config import Config, _ENV_PRESET_KEYS, _load_env_robust
 
 
 class TestConfig(unittest.TestCase):
@@ -32,6 +36,29 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(Config.EMAIL_SMTP_SERVER, 'smtp-mail.outlook.com')
         self.assertEqual(Config.EMAIL_SMTP_PORT, 587)
 
+    def test_validate_rechecks_changed_settings(self):
+        """Test that memoized validation still sees changed settings"""
+        with patch.object(Config, 'TRANSCRIBER_PROVIDER', 'openai'):
+            with patch.object(Config, 'OPENAI_API_KEY', 'sk-test'):
+                self.assertTrue(Config.validate())
+            with patch.object(Config, 'OPENAI_API_KEY', ''):
+                with self.assertRaises(ValueError):
+                    Config.validate()
+
+    def test_env_file_loaded_when_secrets_preset(self):
+        """Test that a .env file is still read when the secrets are already set"""
+        dotenv = types.ModuleType('dotenv')
+        dotenv.load_dotenv = MagicMock()
+        preset = {key: 'from-environment' for key in _ENV_PRESET_KEYS}
+        with tempfile.TemporaryDirectory() as tmp:
+            env_path = Path(tmp) / '.env'
+            env_path.write_text('EMAIL_SMTP_PORT=25\n')
+            with patch.dict(sys.modules, {'dotenv': dotenv}), \
+                    patch.dict(os.environ, preset), \
+                    patch.object(Path, 'cwd', lambda: Path(tmp)):
+                self.assertTrue(_load_env_robust())
+        dotenv.load_dotenv.assert_called_once_with(dotenv_path=str(env_path))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,230 @@
+"""Tests for email sender module"""
+
+import asyncio
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+import smtplib
+from unittest.mock import patch
+from src.config import Config
+from src.email_sender import EmailSender
+
+
+def fake_aiosmtplib(refused=()):
+    """Module stub for aiosmtplib with the exception hierarchy of the real one
+
+    Returns:
+        tuple: (module, session counters, delivered recipients)
+    """
+    sessions = {'open': 0, 'peak': 0}
+    sent = []
+
+    class SMTPException(Exception):
+        pass
+
+    class SMTPResponseException(SMTPException):
+        pass
+
+    class SMTPRecipientsRefused(SMTPException):
+        pass
+
+    class SMTP:
+        def __init__(self, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            sessions['open'] += 1
+            sessions['peak'] = max(sessions['peak'], sessions['open'])
+            return self
+
+        async def __aexit__(self, *exc):
+            sessions['open'] -= 1
+
+        async def login(self, user, password):
+            await asyncio.sleep(0)
+
+        async def send_message(self, message, recipients):
+            await asyncio.sleep(0)
+            if recipients[0] in refused:
+                raise SMTPRecipientsRefused(recipients)
+            sent.extend(recipients)
+
+    module = types.ModuleType('aiosmtplib')
+    module.SMTP = SMTP
+    module.SMTPException = SMTPException
+    module.SMTPResponseException = SMTPResponseException
+    module.SMTPRecipientsRefused = SMTPRecipientsRefused
+    return module, sessions, sent
+
+
+class TestEmailSender(unittest.TestCase):
+    """Test email sending without connecting to a real server"""
+
+    def setUp(self):
+        self.sender = EmailSender(
+            sender_email="notes@example.com",
+            sender_password="secret",
+            smtp_server="smtp.example.com",
+            smtp_port=587
+        )
+        patcher = patch('src.email_sender.smtplib.SMTP')
+        self.mock_smtp = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_send_bulk_reuses_one_connection(self):
+        """Test that all recipients share a single authenticated connection"""
+        recipients = ["a@example.com", "b@example.com", "c@example.com"]
+        results = self.sender.send_bulk(recipients, "Subject", "Body")
+
+        self.assertEqual(results, {r: True for r in recipients})
+        self.assertEqual(self.mock_smtp.call_count, 1)
+        server = self.mock_smtp.return_value
+        server.login.assert_called_once_with("notes@example.com", "secret")
+        self.assertEqual(server.send_message.call_count, 3)
+
+        self.sender.close()
+        server.quit.assert_called_once()
+
+    def test_send_bulk_uses_pool_for_many_recipients(self):
+        """Test that large recipient lists are spread over several connections"""
+        recipients = [f"user{i}@example.com" for i in range(EmailSender.POOL_THRESHOLD + 5)]
+        results = self.sender.send_bulk(recipients, "Subject", "Body", concurrency=3)
+
+        self.assertTrue(all(results.values()))
+        self.assertLessEqual(self.mock_smtp.call_count, 3)
+        self.assertEqual(self.mock_smtp.return_value.send_message.call_count, len(recipients))
+
+    def test_pool_respects_configured_concurrency_cap(self):
+        """Test that the worker count never exceeds EMAIL_MAX_CONCURRENCY"""
+        recipients = [f"user{i}@example.com" for i in range(EmailSender.POOL_THRESHOLD + 5)]
+        with patch.object(Config, 'EMAIL_MAX_CONCURRENCY', 2):
+            results = self.sender.send_bulk(recipients, "Subject", "Body", concurrency=10)
+
+        self.assertTrue(all(results.values()))
+        self.assertLessEqual(self.mock_smtp.call_count, 2)
+
+    def test_pool_backs_off_on_transient_reply(self):
+        """Test that a 450 reply is retried after a pause instead of failing"""
+        recipients = [f"user{i}@example.com" for i in range(EmailSender.POOL_THRESHOLD + 1)]
+        busy = smtplib.SMTPRecipientsRefused({recipients[0]: (450, b"Mailbox busy")})
+        self.mock_smtp.return_value.send_message.side_effect = [busy] + [{}] * len(recipients)
+        with patch('src.email_sender.time.sleep') as mock_sleep:
+            results = self.sender.send_bulk(recipients, "Subject", "Body", concurrency=2)
+
+        self.assertTrue(all(results.values()))
+        mock_sleep.assert_called_once_with(EmailSender.RETRY_BACKOFF_SECONDS)
+
+    def test_pool_does_not_retry_permanent_failure(self):
+        """Test that a 550 rejection is reported without retrying"""
+        recipients = [f"user{i}@example.com" for i in range(EmailSender.POOL_THRESHOLD + 1)]
+        refused = smtplib.SMTPRecipientsRefused({recipients[0]: (550, b"No such user")})
+        self.mock_smtp.return_value.send_message.side_effect = [refused] + [{}] * len(recipients)
+        with patch('src.email_sender.time.sleep') as mock_sleep:
+            results = self.sender.send_bulk(recipients, "Subject", "Body", concurrency=2)
+
+        self.assertEqual(sum(results.values()), len(recipients) - 1)
+        mock_sleep.assert_not_called()
+
+    def test_send_meeting_notes_over_open_session(self):
+        """Test that meeting notes are uploaded once over the session from open_session"""
+        with tempfile.TemporaryDirectory() as tmp:
+            notes = Path(tmp) / "notes.docx"
+            notes.write_bytes(b"notes")
+            recipients = ["a@example.com", "b@example.com"]
+            with self.sender.open_session() as session:
+                ok = self.sender.send_meeting_notes(recipients, "Standup", notes, session=session)
+            with self.sender.open_session() as again:
+                self.assertIs(again, session)
+
+        self.assertTrue(ok)
+        self.assertEqual(self.mock_smtp.call_count, 1)
+        self.assertEqual(session.sent_count, 1)
+        self.mock_smtp.return_value.send_message.assert_called_once()
+        _message, kwargs = self.mock_smtp.return_value.send_message.call_args
+        self.assertEqual(kwargs['to_addrs'], recipients)
+
+    def test_send_meeting_notes_reconnects_when_dropped(self):
+        """Test that a connection dropped mid-send is reopened and the notes resent"""
+        server = self.mock_smtp.return_value
+        server.send_message.side_effect = [smtplib.SMTPServerDisconnected("gone"), {}]
+        with tempfile.TemporaryDirectory() as tmp:
+            notes = Path(tmp) / "notes.docx"
+            notes.write_bytes(b"notes")
+            with patch('src.email_sender.time.sleep'):
+                ok = self.sender.send_meeting_notes(["a@example.com", "b@example.com"],
+                                                    "Standup", notes)
+
+        self.assertTrue(ok)
+        self.assertEqual(self.mock_smtp.call_count, 2)
+        self.assertEqual(server.send_message.call_count, 2)
+
+    def test_session_reconnects_at_per_connection_limit(self):
+        """Test that a connection is recycled after MAX_EMAILS_PER_CONNECTION sends"""
+        recipients = [f"user{i}@example.com" for i in range(5)]
+        with patch.object(Config, 'MAX_EMAILS_PER_CONNECTION', 2):
+            results = self.sender.send_bulk(recipients, "Subject", "Body")
+
+        self.assertTrue(all(results.values()))
+        # 2 + 2 + 1 sends: two reconnects, each preceded by QUIT
+        self.assertEqual(self.mock_smtp.call_count, 3)
+        self.assertEqual(self.mock_smtp.return_value.quit.call_count, 2)
+        self.assertEqual(self.mock_smtp.return_value.send_message.call_count, 5)
+
+    def test_attachment_is_base64_with_short_lines(self):
+        """Test that mapped attachments are base64 encoded in RFC-compliant lines"""
+        payload = bytes(range(256)) * 40
+        with tempfile.TemporaryDirectory() as tmp:
+            notes = Path(tmp) / "notes.docx"
+            notes.write_bytes(payload)
+            empty = Path(tmp) / "empty.txt"
+            empty.write_bytes(b"")
+            message = self.sender._build_message(
+                ["a@example.com"], "Subject", "Body",
+                EmailSender._prepare_attachments([notes, empty])
+            )
+
+        attachments = list(message.iter_attachments())
+        self.assertEqual([a.get_filename() for a in attachments], ["notes.docx", "empty.txt"])
+        self.assertEqual(attachments[0]['Content-Transfer-Encoding'], 'base64')
+        self.assertEqual(attachments[0].get_content(), payload)
+        self.assertEqual(attachments[1].get_content(), b"")
+        for line in attachments[0].get_payload().splitlines():
+            self.assertLessEqual(len(line), 76)
+
+    def test_port_465_uses_implicit_tls(self):
+        """Test that port 465 connects with SMTP_SSL instead of STARTTLS"""
+        sender = EmailSender("notes@example.com", "secret", "smtp.example.com", 465)
+        with patch('src.email_sender._ResumableSMTP_SSL') as mock_ssl:
+            sender.send_bulk(["a@example.com"], "Subject", "Body")
+
+        mock_ssl.assert_called_once()
+        mock_ssl.return_value.starttls.assert_not_called()
+        self.mock_smtp.assert_not_called()
+
+    def test_async_sessions_respect_configured_concurrency_cap(self):
+        """Test that per-domain async sessions never exceed EMAIL_MAX_CONCURRENCY"""
+        aiosmtplib, sessions, _sent = fake_aiosmtplib()
+        recipients = [f"user@domain{i}.example.com" for i in range(6)]
+        with patch.dict(sys.modules, {'aiosmtplib': aiosmtplib}), \
+                patch.object(Config, 'EMAIL_MAX_CONCURRENCY', 2):
+            results = asyncio.run(self.sender.send_bulk_async(recipients, "Subject", "Body"))
+
+        self.assertEqual(results, {r: True for r in recipients})
+        self.assertEqual(sessions['peak'], 2)
+
+    def test_async_refused_recipient_does_not_skip_domain(self):
+        """Test that one refused address leaves the rest of its domain's session working"""
+        aiosmtplib, _sessions, sent = fake_aiosmtplib(refused={"b@example.com"})
+        recipients = ["a@example.com", "b@example.com", "c@example.com"]
+        with patch.dict(sys.modules, {'aiosmtplib': aiosmtplib}):
+            results = asyncio.run(self.sender.send_bulk_async(recipients, "Subject", "Body"))
+
+        self.assertEqual(results, {"a@example.com": True, "b@example.com": False,
+                                   "c@example.com": True})
+        self.assertEqual(sent, ["a@example.com", "c@example.com"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -36,6 +36,39 @@ class TestMeetingNoteFormatter(unittest.TestCase):
         self.formatter.add_bullet_point("Test point")
         self.assertIsNotNone(self.formatter.doc)
     
+    def test_key_points_limited_to_leading_sentences(self):
+        """Test key points skip fragments and stop after ten sentences"""
+        sentences = [f"Sentence number {i} is long enough to keep?" for i in range(15)]
+        self.formatter.add_key_points_from_transcription("Okay. " + " ".join(sentences))
+        
+        texts = [p.text for p in self.formatter.doc.paragraphs]
+        for sentence in sentences[:10]:
+            self.assertIn(sentence, texts)
+        self.assertNotIn(sentences[10], texts)
+        self.assertNotIn("Okay.", texts)
+        self.assertIn("\n... (more points in full transcription)", texts)
+    
+    def test_action_items_are_numbered_in_order(self):
+        """Test action items are appended as numbered paragraphs"""
+        self.formatter.add_action_items(["Draft plan", "Assign owners"])
+        self.formatter.add_text("After")
+        
+        paragraphs = self.formatter.doc.paragraphs
+        self.assertEqual([p.text for p in paragraphs[-3:]], ["Draft plan", "Assign owners", "After"])
+        self.assertEqual(paragraphs[-3].style.name, 'List Number')
+    
+    def test_full_transcription_split_into_paragraphs(self):
+        """Test long transcripts are written as several paragraphs"""
+        sentences = [f"Point {i} was discussed." for i in range(12)]
+        self.formatter.add_full_transcription(" ".join(sentences))
+        
+        texts = [p.text for p in self.formatter.doc.paragraphs]
+        self.assertEqual(texts[-3:], [
+            " ".join(sentences[0:5]),
+            " ".join(sentences[5:10]),
+            " ".join(sentences[10:12]),
+        ])
+    
     def test_save_document(self):
         """Test saving document"""
         self.formatter.add_text("Test content")
@@ -0,0 +1,277 @@
+"""Tests for pipeline orchestration module"""
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from src.config import Config
+from src.email_sender import EmailSender
+from src.pipeline import MeetingPipeline
+from src.transcription import BaseTranscriber, CachedTranscriber
+
+
+class CountingTranscriber(BaseTranscriber):
+    """Transcriber stub that records how often it is called"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe_file(self, audio_file_path):
+        self.calls += 1
+        return "hello world"
+
+
+class FakeFormatter:
+    """MeetingNoteFormatter stub that writes the transcript as the document"""
+
+    builds = 0
+
+    def __init__(self, meeting_title, participants):
+        FakeFormatter.builds += 1
+        self.text = ""
+
+    def add_key_points_from_transcription(self, transcription):
+        self.text = transcription
+
+    def add_full_transcription(self, transcription):
+        pass
+
+    def add_action_items(self, action_items):
+        pass
+
+    def save(self):
+        path = Path(Config.OUTPUT_DIRECTORY) / f"built_{FakeFormatter.builds}.docx"
+        path.write_text(self.text)
+        return str(path)
+
+
+class TestNotesCache(unittest.TestCase):
+    """Test reuse of notes documents built from identical inputs"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = Path(self.tmp.name) / '.notes_cache'
+        FakeFormatter.builds = 0
+        patchers = [
+            patch('src.pipeline.MeetingNoteFormatter', FakeFormatter),
+            patch.object(Config, 'OUTPUT_DIRECTORY', self.tmp.name),
+            patch.object(Config, 'NOTES_NO_CACHE', False),
+            patch.object(Config, 'NOTES_CACHE_TTL_DAYS', 30),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def format_notes(self, transcription="We agreed to ship on Friday."):
+        pipeline = MeetingPipeline(meeting_title="Standup", participants=["a@example.com"])
+        pipeline.transcription = transcription
+        return pipeline.format_notes()
+
+    def cache_entries(self):
+        return sorted(self.cache_dir.iterdir()) if self.cache_dir.exists() else []
+
+    def test_identical_inputs_reuse_notes(self):
+        """Test that a second run with the same inputs copies the cached document"""
+        first = self.format_notes()
+        second = self.format_notes()
+
+        self.assertEqual(FakeFormatter.builds, 1)
+        self.assertNotEqual(first, second)
+        self.assertEqual(Path(second).read_text(), "We agreed to ship on Friday.")
+
+    def test_changed_transcript_rebuilds_notes(self):
+        """Test that a different transcript misses the cache"""
+        self.format_notes()
+        second = self.format_notes("We agreed to ship on Monday.")
+
+        self.assertEqual(FakeFormatter.builds, 2)
+        self.assertEqual(Path(second).read_text(), "We agreed to ship on Monday.")
+        self.assertEqual(len(self.cache_entries()), 2)
+
+    def test_notes_no_cache_always_rebuilds(self):
+        """Test that NOTES_NO_CACHE neither reads nor writes the cache"""
+        with patch.object(Config, 'NOTES_NO_CACHE', True):
+            self.format_notes()
+            self.format_notes()
+
+        self.assertEqual(FakeFormatter.builds, 2)
+        self.assertEqual(self.cache_entries(), [])
+
+    def test_expired_entry_is_rebuilt(self):
+        """Test that an entry older than NOTES_CACHE_TTL_DAYS is not reused"""
+        self.format_notes()
+        entry, = self.cache_entries()
+        stale = time.time() - 31 * 86400
+        os.utime(entry, (stale, stale))
+        self.format_notes()
+
+        self.assertEqual(FakeFormatter.builds, 2)
+        self.assertGreater(entry.stat().st_mtime, stale)
+
+    def test_store_prunes_expired_entries(self):
+        """Test that storing a document deletes other expired entries"""
+        self.cache_dir.mkdir()
+        old = self.cache_dir / "old.docx"
+        old.write_text("old notes")
+        stale = time.time() - 31 * 86400
+        os.utime(old, (stale, stale))
+        recent = self.cache_dir / "recent.docx"
+        recent.write_text("recent notes")
+        self.format_notes()
+
+        names = [path.name for path in self.cache_entries()]
+        self.assertNotIn("old.docx", names)
+        self.assertIn("recent.docx", names)
+        self.assertEqual(len(names), 2)
+
+    def test_rerun_on_recording_reuses_notes(self):
+        """Test that processing the same recording again reuses its notes"""
+        audio = Path(self.tmp.name) / "meeting.wav"
+        audio.write_bytes(b"RIFF fake audio")
+        transcriber = CachedTranscriber(CountingTranscriber(), ttl_seconds=0,
+                                        cache_dir=Path(self.tmp.name) / "transcripts")
+        with patch('src.pipeline.get_transcriber', return_value=transcriber):
+            for _ in range(2):
+                pipeline = MeetingPipeline(meeting_title="Standup")
+                pipeline.send_notes = MagicMock(return_value=True)
+                self.assertTrue(pipeline.run_full_pipeline(audio_file=str(audio)))
+
+        self.assertEqual(FakeFormatter.builds, 1)
+
+    def test_failed_store_leaves_no_partial_entry(self):
+        """Test that a failed copy keeps the notes and leaves no temp or cache file"""
+        with patch('src.pipeline.shutil.copy', side_effect=OSError("disk full")):
+            notes = self.format_notes()
+
+        self.assertTrue(Path(notes).is_file())
+        self.assertEqual(self.cache_entries(), [])
+
+
+class TestExistingRecording(unittest.TestCase):
+    """Test running the pipeline on a recording instead of capturing"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.audio = Path(self.tmp.name) / "meeting.wav"
+        self.audio.write_bytes(b"RIFF fake audio")
+        self.delegate = CountingTranscriber()
+        transcriber = CachedTranscriber(self.delegate, cache_dir=Path(self.tmp.name) / "cache",
+                                        ttl_seconds=0)
+        patcher = patch('src.pipeline.get_transcriber', return_value=transcriber)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_pipeline(self, audio_file):
+        pipeline = MeetingPipeline(meeting_title="Standup")
+        pipeline.capture_audio = MagicMock()
+        pipeline.format_notes = MagicMock(return_value=True)
+        pipeline.send_notes = MagicMock(return_value=True)
+        return pipeline, pipeline.run_full_pipeline(audio_file=audio_file)
+
+    def test_audio_file_skips_capture(self):
+        """Test that an existing recording is transcribed without capturing"""
+        pipeline, ok = self.run_pipeline(str(self.audio))
+
+        self.assertTrue(ok)
+        pipeline.capture_audio.assert_not_called()
+        self.assertEqual(pipeline.audio_file, str(self.audio))
+
+    def test_rerun_on_same_recording_hits_transcript_cache(self):
+        """Test that processing the same recording twice transcribes it once"""
+        self.run_pipeline(str(self.audio))
+        self.run_pipeline(str(self.audio))
+
+        self.assertEqual(self.delegate.calls, 1)
+
+    def test_missing_audio_file_fails(self):
+        """Test that a missing recording stops the pipeline before transcription"""
+        pipeline, ok = self.run_pipeline(str(Path(self.tmp.name) / "missing.wav"))
+
+        self.assertFalse(ok)
+        pipeline.capture_audio.assert_not_called()
+        self.assertEqual(self.delegate.calls, 0)
+
+
+class TestRunFullPipeline(unittest.TestCase):
+    """Test SMTP warm-up and cleanup around the pipeline stages"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.audio = Path(self.tmp.name) / "meeting.wav"
+        self.audio.write_bytes(b"RIFF fake audio")
+        self.notes = Path(self.tmp.name) / "notes.docx"
+        self.notes.write_bytes(b"notes")
+        patchers = [
+            patch('src.email_sender.smtplib.SMTP'),
+            patch('src.pipeline.get_transcriber', return_value=CountingTranscriber()),
+            patch.object(Config, 'EMAIL_SMTP_PORT', 587),
+            patch.object(Config, 'EMAIL_USE_SSL', False),
+        ]
+        self.mock_smtp = patchers[0].start()
+        for patcher in patchers[1:]:
+            patcher.start()
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+    def run_pipeline(self, notes_saved):
+        pipeline = MeetingPipeline(meeting_title="Standup", participants=["a@example.com"])
+
+        def format_notes(**kwargs):
+            # Long enough for the warm-up to have started
+            time.sleep(0.01)
+            pipeline.notes_file = str(self.notes) if notes_saved else None
+            return pipeline.notes_file
+
+        pipeline.format_notes = format_notes
+        return pipeline.run_full_pipeline(audio_file=str(self.audio))
+
+    def assert_connections_closed(self):
+        server = self.mock_smtp.return_value
+        self.assertEqual(server.quit.call_count + server.close.call_count,
+                         self.mock_smtp.call_count)
+
+    def test_warm_connection_reused_for_sending(self):
+        """Test that the notes go out over the connection opened during formatting"""
+        self.assertTrue(self.run_pipeline(notes_saved=True))
+
+        server = self.mock_smtp.return_value
+        self.assertEqual(self.mock_smtp.call_count, 1)
+        server.login.assert_called_once()
+        server.send_message.assert_called_once()
+        self.assert_connections_closed()
+
+    def test_failed_stage_leaves_no_connection_open(self):
+        """Test that a warm-up login is closed when a later stage fails"""
+        warm_up = EmailSender.warm_up
+
+        def late_warm_up(sender):
+            # Not yet connected when formatting fails: the window in which
+            # close() used to run first and the login then leaked
+            time.sleep(0.05)
+            return warm_up(sender)
+
+        with patch.object(EmailSender, 'warm_up', late_warm_up):
+            self.assertFalse(self.run_pipeline(notes_saved=False))
+            # Let a warm-up the pipeline failed to wait for finish its login
+            time.sleep(0.1)
+
+        server = self.mock_smtp.return_value
+        server.login.assert_called_once()
+        server.send_message.assert_not_called()
+        self.assert_connections_closed()
+
+    def test_failed_transcription_never_logs_in(self):
+        """Test that no SMTP login happens before transcription succeeds"""
+        with patch.object(CountingTranscriber, 'transcribe_file', return_value=None):
+            self.assertFalse(self.run_pipeline(notes_saved=True))
+
+        self.mock_smtp.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
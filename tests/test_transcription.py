@@ -0,0 +1,428 @@
+"""Tests for transcription module"""
+
+import functools
+import os
+import struct
+import sys
+import tempfile
+import time
+import types
+import unittest
+import wave
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from src.transcription import (
+    AzureTranscriber, BaseTranscriber, CachedTranscriber, WhisperLocalTranscriber, split_audio_vad
+)
+
+
+class CountingTranscriber(BaseTranscriber):
+    """Transcriber stub that records how often it is called"""
+
+    def __init__(self, text="hello world", model="counting:v1"):
+        self.text = text
+        self.model = model
+        self.calls = 0
+
+    @property
+    def model_id(self):
+        return self.model
+
+    def transcribe_file(self, audio_file_path):
+        self.calls += 1
+        return self.text
+
+
+class FakeSignal:
+    def __init__(self):
+        self.callbacks = []
+
+    def connect(self, callback):
+        self.callbacks.append(callback)
+
+    def fire(self, evt):
+        for callback in self.callbacks:
+            callback(evt)
+
+
+def fake_speechsdk(sessions):
+    """Module stub for the Azure Speech SDK
+
+    Each recognizer replays the next script from ``sessions`` once its push
+    stream is closed. A script is a list of ('recognized', text),
+    ('canceled', reason, code, details) and ('stopped',) events.
+    """
+    sdk = types.ModuleType('azure.cognitiveservices.speech')
+    sdk.ResultReason = types.SimpleNamespace(RecognizedSpeech='RecognizedSpeech', NoMatch='NoMatch')
+    sdk.CancellationReason = types.SimpleNamespace(Error='Error', EndOfStream='EndOfStream')
+    sdk.CancellationErrorCode = types.SimpleNamespace(
+        TooManyRequests='TooManyRequests', NoError='NoError', ServiceError='ServiceError'
+    )
+    sdk.recognizers = []
+    done = types.SimpleNamespace(get=lambda: None)
+
+    class PushAudioInputStream:
+        def __init__(self, stream_format):
+            self.written = b""
+            self.on_close = None
+
+        def write(self, chunk):
+            self.written += chunk
+
+        def close(self):
+            self.on_close()
+
+    class SpeechRecognizer:
+        def __init__(self, speech_config, audio_config):
+            self.stream = audio_config.stream
+            self.stream.on_close = self.replay
+            self.script = sessions.pop(0)
+            self.stopped = False
+            self.recognized = FakeSignal()
+            self.canceled = FakeSignal()
+            self.session_stopped = FakeSignal()
+            sdk.recognizers.append(self)
+
+        def start_continuous_recognition_async(self):
+            return done
+
+        def stop_continuous_recognition_async(self):
+            self.stopped = True
+            return done
+
+        def replay(self):
+            for kind, *args in self.script:
+                if kind == 'recognized':
+                    result = types.SimpleNamespace(reason='RecognizedSpeech', text=args[0])
+                    self.recognized.fire(types.SimpleNamespace(result=result))
+                elif kind == 'canceled':
+                    reason, code, details = args
+                    cancellation = types.SimpleNamespace(reason=reason, code=code, error_details=details)
+                    self.canceled.fire(types.SimpleNamespace(cancellation_details=cancellation))
+                else:
+                    self.session_stopped.fire(types.SimpleNamespace())
+
+    sdk.SpeechConfig = lambda subscription, region: types.SimpleNamespace(
+        speech_recognition_language=None
+    )
+    sdk.SpeechRecognizer = SpeechRecognizer
+    sdk.audio = types.SimpleNamespace(
+        AudioStreamFormat=lambda **kwargs: kwargs,
+        PushAudioInputStream=PushAudioInputStream,
+        AudioConfig=lambda stream: types.SimpleNamespace(stream=stream),
+    )
+    return sdk
+
+
+class SegmentTranscriber(BaseTranscriber):
+    """Parallel-capable stub that names each WAV segment by its sample value"""
+
+    supports_parallel = True
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.paths = []
+
+    def transcribe_file(self, audio_file_path):
+        self.paths.append(audio_file_path)
+        with wave.open(str(audio_file_path), 'rb') as wf:
+            value, = struct.unpack('<h', wf.readframes(1))
+        # Later segments finish first, so results arrive out of order
+        time.sleep(0.002 * (10 - value // 100))
+        if value == self.fail_on:
+            return None
+        return f" part{value // 100} "
+
+
+class TestCachedTranscriber(unittest.TestCase):
+    """Test the on-disk transcript cache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.audio = Path(self.tmp.name) / "audio.wav"
+        self.audio.write_bytes(b"RIFF fake audio")
+        self.cache_dir = Path(self.tmp.name) / "cache"
+
+    def test_second_call_uses_cache(self):
+        """Test that identical audio is only transcribed once"""
+        delegate = CountingTranscriber()
+        cached = CachedTranscriber(delegate, cache_dir=self.cache_dir, ttl_seconds=0)
+
+        self.assertEqual(cached.transcribe_file(str(self.audio)), "hello world")
+        self.assertEqual(cached.transcribe_file(str(self.audio)), "hello world")
+        self.assertEqual(delegate.calls, 1)
+
+    def test_changed_audio_misses_cache(self):
+        """Test that different audio content is transcribed again"""
+        delegate = CountingTranscriber()
+        cached = CachedTranscriber(delegate, cache_dir=self.cache_dir, ttl_seconds=0)
+
+        cached.transcribe_file(str(self.audio))
+        self.audio.write_bytes(b"RIFF other audio")
+        cached.transcribe_file(str(self.audio))
+        self.assertEqual(delegate.calls, 2)
+
+    def test_different_model_misses_cache(self):
+        """Test that a transcript from another model is not reused"""
+        first = CountingTranscriber(model="counting:v1")
+        second = CountingTranscriber(model="counting:v2")
+        CachedTranscriber(first, cache_dir=self.cache_dir, ttl_seconds=0).transcribe_file(str(self.audio))
+        CachedTranscriber(second, cache_dir=self.cache_dir, ttl_seconds=0).transcribe_file(str(self.audio))
+        self.assertEqual(second.calls, 1)
+        self.assertEqual(len(list(self.cache_dir.glob('*.json'))), 2)
+
+    def test_expired_entry_is_ignored(self):
+        """Test that entries older than the TTL are re-transcribed"""
+        delegate = CountingTranscriber()
+        cached = CachedTranscriber(delegate, cache_dir=self.cache_dir, ttl_seconds=60)
+
+        cached.transcribe_file(str(self.audio))
+        old = time.time() - 120
+        for entry in self.cache_dir.glob('*.json'):
+            os.utime(entry, (old, old))
+        cached.transcribe_file(str(self.audio))
+        self.assertEqual(delegate.calls, 2)
+
+    def test_failed_transcription_not_cached(self):
+        """Test that failures are not stored"""
+        delegate = CountingTranscriber(text=None)
+        cached = CachedTranscriber(delegate, cache_dir=self.cache_dir, ttl_seconds=0)
+
+        self.assertIsNone(cached.transcribe_file(str(self.audio)))
+        cached.transcribe_file(str(self.audio))
+        self.assertEqual(delegate.calls, 2)
+
+
+class TestSplitAudioVad(unittest.TestCase):
+    """Test voice-activity based segmentation"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.audio = Path(self.tmp.name) / "audio.wav"
+        with wave.open(str(self.audio), 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b"\x00\x00" * 16000 * 5)
+
+    def test_segments_cover_audio_in_order(self):
+        """Test that segments are contiguous and split where the VAD hears no speech"""
+        webrtcvad = MagicMock()
+        webrtcvad.Vad.return_value.is_speech.return_value = False
+        with patch.dict(sys.modules, {'webrtcvad': webrtcvad}):
+            segments = split_audio_vad(self.audio, self.tmp.name, min_seconds=1, max_seconds=2)
+
+        self.assertEqual(len(segments), 5)
+        self.assertEqual(segments[0][0], 0)
+        self.assertAlmostEqual(segments[-1][1], 5.0)
+        for (_, end, _), (start, _, _) in zip(segments, segments[1:]):
+            self.assertEqual(end, start)
+        for _, _, path in segments:
+            self.assertTrue(Path(path).exists())
+
+
+class TestParallelTranscription(unittest.TestCase):
+    """Test segment fan-out in BaseTranscriber.transcribe_file_parallel"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.audio = Path(self.tmp.name) / "audio.wav"
+        with wave.open(str(self.audio), 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            # Five one-second stretches with sample values 100..500
+            for second in range(1, 6):
+                wf.writeframes(struct.pack('<h', second * 100) * 16000)
+        self.webrtcvad = MagicMock()
+        self.webrtcvad.Vad.return_value.is_speech.return_value = False
+        patcher = patch.dict(sys.modules, {'webrtcvad': self.webrtcvad})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def split_per_second(self):
+        """Patch the splitter to cut every second and hand segments back reversed"""
+        split = functools.partial(split_audio_vad, min_seconds=1, max_seconds=1)
+        return patch('src.transcription.split_audio_vad',
+                     side_effect=lambda *args: list(reversed(split(*args))))
+
+    def test_segments_joined_in_playback_order(self):
+        """Test that segment texts are joined by start time, not completion order"""
+        transcriber = SegmentTranscriber()
+        with self.split_per_second():
+            text = transcriber.transcribe_file_parallel(str(self.audio), max_concurrency=5)
+
+        self.assertEqual(text, "part1 part2 part3 part4 part5")
+        self.assertEqual(len(transcriber.paths), 5)
+
+    def test_failed_segment_fails_transcription(self):
+        """Test that one failed segment makes the whole transcription fail"""
+        transcriber = SegmentTranscriber(fail_on=300)
+        with self.split_per_second():
+            self.assertIsNone(transcriber.transcribe_file_parallel(str(self.audio), max_concurrency=5))
+
+    def test_short_audio_transcribed_whole(self):
+        """Test that audio fitting in one segment is sent as the original file"""
+        transcriber = SegmentTranscriber()
+        text = transcriber.transcribe_file_parallel(str(self.audio), max_concurrency=5)
+
+        self.assertEqual(text, " part1 ")
+        self.assertEqual(transcriber.paths, [str(self.audio)])
+
+    def test_non_wav_and_serial_providers_not_split(self):
+        """Test the fallbacks for non-WAV input and providers without parallel support"""
+        flac = self.audio.with_suffix('.flac')
+        flac.write_bytes(b"fLaC")
+        serial = CountingTranscriber()
+        parallel = SegmentTranscriber()
+        with patch('src.transcription.split_audio_vad') as split, \
+                patch.object(parallel, 'transcribe_file', return_value="flac text"):
+            self.assertEqual(serial.transcribe_file_parallel(str(self.audio), max_concurrency=5),
+                             "hello world")
+            self.assertEqual(parallel.transcribe_file_parallel(str(flac), max_concurrency=5),
+                             "flac text")
+
+        split.assert_not_called()
+        self.assertEqual(serial.calls, 1)
+
+
+class TestAzureTranscriber(unittest.TestCase):
+    """Test continuous recognition against a fake Speech SDK"""
+
+    END_OF_STREAM = ('canceled', 'EndOfStream', 'NoError', '')
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.audio = Path(self.tmp.name) / "audio.wav"
+        self.pcm = bytes(range(256)) * 250
+        with wave.open(str(self.audio), 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(self.pcm)
+
+    def transcribe(self, *sessions):
+        self.sdk = fake_speechsdk(list(sessions))
+        modules = {
+            'azure': types.ModuleType('azure'),
+            'azure.cognitiveservices': types.ModuleType('azure.cognitiveservices'),
+            'azure.cognitiveservices.speech': self.sdk,
+        }
+        modules['azure'].cognitiveservices = modules['azure.cognitiveservices']
+        modules['azure.cognitiveservices'].speech = self.sdk
+        with patch.dict(sys.modules, modules), \
+                patch('src.transcription.time.sleep') as self.sleep:
+            return AzureTranscriber().transcribe_file(str(self.audio))
+
+    def test_collects_every_utterance(self):
+        """Test that all recognized utterances are joined, not just the first"""
+        text = self.transcribe([
+            ('recognized', "First part."), ('recognized', "Second part."),
+            self.END_OF_STREAM, ('stopped',),
+        ])
+
+        self.assertEqual(text, "First part. Second part.")
+        recognizer, = self.sdk.recognizers
+        self.assertEqual(recognizer.stream.written, self.pcm)
+        self.assertTrue(recognizer.stopped)
+
+    def test_error_cancel_fails_transcription(self):
+        """Test that an error cancel returns None while end of stream does not"""
+        text = self.transcribe([
+            ('recognized', "Partial."),
+            ('canceled', 'Error', 'ServiceError', "Authentication failed"),
+        ])
+
+        self.assertIsNone(text)
+        self.sleep.assert_not_called()
+
+    def test_too_many_requests_is_retried(self):
+        """Test that a TooManyRequests cancel backs off and starts a new session"""
+        text = self.transcribe(
+            [('canceled', 'Error', 'TooManyRequests', "Too many requests")],
+            [('recognized', "Done."), self.END_OF_STREAM, ('stopped',)],
+        )
+
+        self.assertEqual(text, "Done.")
+        self.assertEqual(len(self.sdk.recognizers), 2)
+        self.sleep.assert_called_once()
+
+    def test_throttling_backs_off_then_gives_up(self):
+        """Test capped exponential backoff on 429s, detected by code or by message"""
+        throttled = [
+            [('canceled', 'Error', 'TooManyRequests', "")],
+            [('canceled', 'Error', None, "HTTP 429: Too Many Requests")],
+        ]
+        text = self.transcribe(*(throttled * 3))
+
+        self.assertIsNone(text)
+        self.assertEqual(len(self.sdk.recognizers), AzureTranscriber.MAX_RETRIES + 1)
+        delays = [call.args[0] for call in self.sleep.call_args_list]
+        self.assertEqual(len(delays), AzureTranscriber.MAX_RETRIES)
+        for attempt, delay in enumerate(delays):
+            base = min(2 ** attempt, AzureTranscriber.MAX_BACKOFF_SECONDS)
+            self.assertGreaterEqual(delay, base)
+            self.assertLess(delay, base + 1)
+
+    def test_session_that_never_ends_times_out(self):
+        """Test that a missing session_stopped/canceled event cannot hang transcription"""
+        with patch.object(AzureTranscriber, 'RECOGNITION_TIMEOUT_FACTOR', 0), \
+                patch.object(AzureTranscriber, 'RECOGNITION_TIMEOUT_SECONDS', 0.05):
+            text = self.transcribe([('recognized', "Stuck.")])
+
+        self.assertIsNone(text)
+        self.assertTrue(self.sdk.recognizers[0].stopped)
+
+
+class TestWhisperModelCache(unittest.TestCase):
+    """Test that local Whisper models are loaded once per process"""
+
+    def setUp(self):
+        self.whisper = MagicMock()
+        patchers = [
+            # None makes the faster_whisper import fail, selecting openai-whisper
+            patch.dict(sys.modules, {'whisper': self.whisper, 'faster_whisper': None}),
+            patch.object(WhisperLocalTranscriber, '_model_cache', {}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_model_loaded_once_per_name(self):
+        """Test that instances share the model loaded for their name"""
+        first = WhisperLocalTranscriber("base")
+        second = WhisperLocalTranscriber("base")
+        WhisperLocalTranscriber("tiny")
+
+        self.assertIs(first.model, second.model)
+        self.assertEqual(self.whisper.load_model.call_count, 2)
+        self.assertEqual(first.model_id, "whisper:base")
+
+    def test_whisper_uses_cuda_when_available(self):
+        """Test that openai-whisper is loaded onto the GPU when CUDA is present"""
+        torch = MagicMock()
+        torch.cuda.is_available.return_value = True
+        with patch.dict(sys.modules, {'torch': torch}):
+            WhisperLocalTranscriber("small")
+
+        self.whisper.load_model.assert_called_once_with("small", device="cuda")
+
+    def test_prefers_faster_whisper_quantized_on_cpu(self):
+        """Test that faster-whisper is used with int8 when no GPU is present"""
+        faster_whisper = MagicMock()
+        ctranslate2 = MagicMock()
+        ctranslate2.get_cuda_device_count.return_value = 0
+        with patch.dict(sys.modules, {'faster_whisper': faster_whisper, 'ctranslate2': ctranslate2}):
+            transcriber = WhisperLocalTranscriber("small")
+
+        faster_whisper.WhisperModel.assert_called_once_with("small", device="cpu", compute_type="int8")
+        self.whisper.load_model.assert_not_called()
+        self.assertEqual(transcriber.model_id, "faster-whisper:small:int8")
+
+
+if __name__ == '__main__':
+    unittest.main()